@@ -5,8 +5,24 @@ d = { 'settings': { 'branch': 'main',
                 'doc_host': 'https://Hopsakee.github.io',
                 'git_url': 'https://github.com/Hopsakee/infoflow',
                 'lib_path': 'infoflow'},
-  'syms': { 'infoflow.classdb': { 'infoflow.classdb.Improvement': ('classes_db.html#improvement', 'infoflow/classdb.py'),
-                                  'infoflow.classdb.Improvement.__init__': ('classes_db.html#improvement.__init__', 'infoflow/classdb.py'),
+  'syms': { 'infoflow.classdb': { 'infoflow.classdb.ConnectionPool': ('classes_db.html#connectionpool', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.ConnectionPool.__getattr__': ( 'classes_db.html#connectionpool.__getattr__',
+                                                                                   'infoflow/classdb.py'),
+                                  'infoflow.classdb.ConnectionPool.__init__': ( 'classes_db.html#connectionpool.__init__',
+                                                                                'infoflow/classdb.py'),
+                                  'infoflow.classdb.ConnectionPool.__len__': ( 'classes_db.html#connectionpool.__len__',
+                                                                               'infoflow/classdb.py'),
+                                  'infoflow.classdb.ConnectionPool.close': ('classes_db.html#connectionpool.close', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.ConnectionPool.connect': ( 'classes_db.html#connectionpool.connect',
+                                                                               'infoflow/classdb.py'),
+                                  'infoflow.classdb.ConnectionPool.db': ('classes_db.html#connectionpool.db', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.ConnectionProfile': ('classes_db.html#connectionprofile', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.ConnectionProfile.apply': ( 'classes_db.html#connectionprofile.apply',
+                                                                                'infoflow/classdb.py'),
+                                  'infoflow.classdb.ConnectionProfile.pragmas': ( 'classes_db.html#connectionprofile.pragmas',
+                                                                                  'infoflow/classdb.py'),
+                                  'infoflow.classdb.DuplicateSlugError': ('classes_db.html#duplicateslugerror', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Improvement': ('classes_db.html#improvement', 'infoflow/classdb.py'),
                                   'infoflow.classdb.Improvement.db_serialize': ( 'classes_db.html#improvement.db_serialize',
                                                                                  'infoflow/classdb.py'),
                                   'infoflow.classdb.Improvement.flatten_for_db': ( 'classes_db.html#improvement.flatten_for_db',
@@ -14,13 +30,7 @@ d = { 'settings': { 'branch': 'main',
                                   'infoflow.classdb.Improvement.from_db': ('classes_db.html#improvement.from_db', 'infoflow/classdb.py'),
                                   'infoflow.classdb.Improvement.get_db_schema': ( 'classes_db.html#improvement.get_db_schema',
                                                                                   'infoflow/classdb.py'),
-                                  'infoflow.classdb.Improvement.get_instances': ( 'classes_db.html#improvement.get_instances',
-                                                                                  'infoflow/classdb.py'),
-                                  'infoflow.classdb.Improvement.validate_tool_names': ( 'classes_db.html#improvement.validate_tool_names',
-                                                                                        'infoflow/classdb.py'),
                                   'infoflow.classdb.InformationItem': ('classes_db.html#informationitem', 'infoflow/classdb.py'),
-                                  'infoflow.classdb.InformationItem.__init__': ( 'classes_db.html#informationitem.__init__',
-                                                                                 'infoflow/classdb.py'),
                                   'infoflow.classdb.InformationItem._parse_toolflow': ( 'classes_db.html#informationitem._parse_toolflow',
                                                                                         'infoflow/classdb.py'),
                                   'infoflow.classdb.InformationItem.db_serialize': ( 'classes_db.html#informationitem.db_serialize',
@@ -31,11 +41,24 @@ d = { 'settings': { 'branch': 'main',
                                                                                 'infoflow/classdb.py'),
                                   'infoflow.classdb.InformationItem.get_db_schema': ( 'classes_db.html#informationitem.get_db_schema',
                                                                                       'infoflow/classdb.py'),
-                                  'infoflow.classdb.InformationItem.get_instances': ( 'classes_db.html#informationitem.get_instances',
-                                                                                      'infoflow/classdb.py'),
                                   'infoflow.classdb.InformationType': ('classes_db.html#informationtype', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.LazyModel': ('classes_db.html#lazymodel', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.LazyModel.__getattr__': ( 'classes_db.html#lazymodel.__getattr__',
+                                                                              'infoflow/classdb.py'),
+                                  'infoflow.classdb.LazyModel.__init__': ('classes_db.html#lazymodel.__init__', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.LazyModel.__repr__': ('classes_db.html#lazymodel.__repr__', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.LazyModel.flatten_for_db': ( 'classes_db.html#lazymodel.flatten_for_db',
+                                                                                 'infoflow/classdb.py'),
+                                  'infoflow.classdb.LazyModel.to_model': ('classes_db.html#lazymodel.to_model', 'infoflow/classdb.py'),
                                   'infoflow.classdb.Method': ('classes_db.html#method', 'infoflow/classdb.py'),
                                   'infoflow.classdb.OrganizationSystem': ('classes_db.html#organizationsystem', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.PackedPhases': ('classes_db.html#packedphases', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.PackedPhases.code': ('classes_db.html#packedphases.code', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.PackedPhases.from_packed': ( 'classes_db.html#packedphases.from_packed',
+                                                                                 'infoflow/classdb.py'),
+                                  'infoflow.classdb.PackedPhases.packed': ('classes_db.html#packedphases.packed', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.PackedPhases.packed_sql': ( 'classes_db.html#packedphases.packed_sql',
+                                                                                'infoflow/classdb.py'),
                                   'infoflow.classdb.Phase': ('classes_db.html#phase', 'infoflow/classdb.py'),
                                   'infoflow.classdb.PhaseMethodData': ('classes_db.html#phasemethoddata', 'infoflow/classdb.py'),
                                   'infoflow.classdb.PhaseQuality': ('classes_db.html#phasequality', 'infoflow/classdb.py'),
@@ -45,27 +68,274 @@ d = { 'settings': { 'branch': 'main',
                                                                                'infoflow/classdb.py'),
                                   'infoflow.classdb.PhaseToolflowData._val': ( 'classes_db.html#phasetoolflowdata._val',
                                                                                'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry': ('classes_db.html#registry', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.__contains__': ( 'classes_db.html#registry.__contains__',
+                                                                              'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.__delitem__': ('classes_db.html#registry.__delitem__', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.__getitem__': ('classes_db.html#registry.__getitem__', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.__init__': ('classes_db.html#registry.__init__', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.__iter__': ('classes_db.html#registry.__iter__', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.__len__': ('classes_db.html#registry.__len__', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.__repr__': ('classes_db.html#registry.__repr__', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.__setitem__': ('classes_db.html#registry.__setitem__', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry._all': ('classes_db.html#registry._all', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry._own': ('classes_db.html#registry._own', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry._touch': ('classes_db.html#registry._touch', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.items': ('classes_db.html#registry.items', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.keys': ('classes_db.html#registry.keys', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.pop': ('classes_db.html#registry.pop', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Registry.values': ('classes_db.html#registry.values', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository': ('classes_db.html#repository', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository.__init__': ('classes_db.html#repository.__init__', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository._changed': ('classes_db.html#repository._changed', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository._load': ('classes_db.html#repository._load', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository._register': ('classes_db.html#repository._register', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository._write': ('classes_db.html#repository._write', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository.improvement': ( 'classes_db.html#repository.improvement',
+                                                                               'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository.load': ('classes_db.html#repository.load', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository.save_improvement': ( 'classes_db.html#repository.save_improvement',
+                                                                                    'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository.save_item': ('classes_db.html#repository.save_item', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository.save_tool': ('classes_db.html#repository.save_tool', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository.sync': ('classes_db.html#repository.sync', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.Repository.toolflow': ('classes_db.html#repository.toolflow', 'infoflow/classdb.py'),
                                   'infoflow.classdb.SluggedModel': ('classes_db.html#sluggedmodel', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.SluggedModel.__init__': ( 'classes_db.html#sluggedmodel.__init__',
+                                                                              'infoflow/classdb.py'),
                                   'infoflow.classdb.SluggedModel._fld': ('classes_db.html#sluggedmodel._fld', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.SluggedModel.get_instances': ( 'classes_db.html#sluggedmodel.get_instances',
+                                                                                   'infoflow/classdb.py'),
                                   'infoflow.classdb.SluggedModel.slug': ('classes_db.html#sluggedmodel.slug', 'infoflow/classdb.py'),
                                   'infoflow.classdb.Tool': ('classes_db.html#tool', 'infoflow/classdb.py'),
-                                  'infoflow.classdb.Tool.__init__': ('classes_db.html#tool.__init__', 'infoflow/classdb.py'),
                                   'infoflow.classdb.Tool.flatten_for_db': ('classes_db.html#tool.flatten_for_db', 'infoflow/classdb.py'),
                                   'infoflow.classdb.Tool.from_db': ('classes_db.html#tool.from_db', 'infoflow/classdb.py'),
                                   'infoflow.classdb.Tool.get_db_schema': ('classes_db.html#tool.get_db_schema', 'infoflow/classdb.py'),
-                                  'infoflow.classdb.Tool.get_instances': ('classes_db.html#tool.get_instances', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.ToolflowIndex': ('classes_db.html#toolflowindex', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.ToolflowIndex.__init__': ( 'classes_db.html#toolflowindex.__init__',
+                                                                               'infoflow/classdb.py'),
+                                  'infoflow.classdb.ToolflowIndex.add_item': ( 'classes_db.html#toolflowindex.add_item',
+                                                                               'infoflow/classdb.py'),
+                                  'infoflow.classdb.ToolflowIndex.add_tool': ( 'classes_db.html#toolflowindex.add_tool',
+                                                                               'infoflow/classdb.py'),
+                                  'infoflow.classdb.ToolflowIndex.items_for_tool': ( 'classes_db.html#toolflowindex.items_for_tool',
+                                                                                     'infoflow/classdb.py'),
+                                  'infoflow.classdb.ToolflowIndex.remove_item': ( 'classes_db.html#toolflowindex.remove_item',
+                                                                                  'infoflow/classdb.py'),
+                                  'infoflow.classdb.ToolflowIndex.tool': ('classes_db.html#toolflowindex.tool', 'infoflow/classdb.py'),
+                                  'infoflow.classdb._improvement_page': ('classes_db.html#_improvement_page', 'infoflow/classdb.py'),
+                                  'infoflow.classdb._profile': ('classes_db.html#_profile', 'infoflow/classdb.py'),
+                                  'infoflow.classdb._replaced': ('classes_db.html#_replaced', 'infoflow/classdb.py'),
+                                  'infoflow.classdb._toolflow_slugs': ('classes_db.html#_toolflow_slugs', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.backfill_phase_codes': ('classes_db.html#backfill_phase_codes', 'infoflow/classdb.py'),
                                   'infoflow.classdb.create_db': ('classes_db.html#create_db', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.create_revisions_table': ( 'classes_db.html#create_revisions_table',
+                                                                               'infoflow/classdb.py'),
                                   'infoflow.classdb.create_tables_from_pydantic': ( 'classes_db.html#create_tables_from_pydantic',
                                                                                     'infoflow/classdb.py'),
-                                  'infoflow.classdb.dict_from_db': ('classes_db.html#dict_from_db', 'infoflow/classdb.py')},
+                                  'infoflow.classdb.db_revision': ('classes_db.html#db_revision', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.dict_from_db': ('classes_db.html#dict_from_db', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.improvements_by_tool': ('classes_db.html#improvements_by_tool', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.improvements_for_tool': ( 'classes_db.html#improvements_for_tool',
+                                                                              'infoflow/classdb.py'),
+                                  'infoflow.classdb.registry': ('classes_db.html#registry', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.registry_scope': ('classes_db.html#registry_scope', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.upsert_model': ('classes_db.html#upsert_model', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.use_profile': ('classes_db.html#use_profile', 'infoflow/classdb.py'),
+                                  'infoflow.classdb.write_transaction': ('classes_db.html#write_transaction', 'infoflow/classdb.py')},
+            'infoflow.coverage': { 'infoflow.coverage.Coverage': ('coverage.html#coverage', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage.__init__': ('coverage.html#coverage.__init__', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage._apply': ('coverage.html#coverage._apply', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage._contrib': ('coverage.html#coverage._contrib', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage._tool': ('coverage.html#coverage._tool', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage.add_item': ('coverage.html#coverage.add_item', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage.add_tool': ('coverage.html#coverage.add_tool', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage.counts': ('coverage.html#coverage.counts', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage.gaps': ('coverage.html#coverage.gaps', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage.known': ('coverage.html#coverage.known', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage.quality': ('coverage.html#coverage.quality', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage.remove_item': ('coverage.html#coverage.remove_item', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.Coverage.top_tools': ('coverage.html#coverage.top_tools', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.GapReport': ('coverage.html#gapreport', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.GapReport.pairs': ('coverage.html#gapreport.pairs', 'infoflow/coverage.py'),
+                                   'infoflow.coverage.GapReport.phases_without_tool': ( 'coverage.html#gapreport.phases_without_tool',
+                                                                                        'infoflow/coverage.py'),
+                                   'infoflow.coverage.GapReport.types_without_refine': ( 'coverage.html#gapreport.types_without_refine',
+                                                                                         'infoflow/coverage.py')},
             'infoflow.creinst': { 'infoflow.creinst.db_from_instances': ('create_instances.html#db_from_instances', 'infoflow/creinst.py'),
                                   'infoflow.creinst.informationitems_from_code': ( 'create_instances.html#informationitems_from_code',
                                                                                    'infoflow/creinst.py'),
+                                  'infoflow.creinst.random_instances': ('create_instances.html#random_instances', 'infoflow/creinst.py'),
                                   'infoflow.creinst.tools_from_code': ('create_instances.html#tools_from_code', 'infoflow/creinst.py')},
-            'infoflow.viz': { 'infoflow.viz.build_graphiz_from_intances': ( 'create_vizualisation.html#build_graphiz_from_intances',
+            'infoflow.exporter': { 'infoflow.exporter._csv_lines': ('exporter.html#_csv_lines', 'infoflow/exporter.py'),
+                                   'infoflow.exporter._table': ('exporter.html#_table', 'infoflow/exporter.py'),
+                                   'infoflow.exporter.export_lines': ('exporter.html#export_lines', 'infoflow/exporter.py'),
+                                   'infoflow.exporter.export_rows': ('exporter.html#export_rows', 'infoflow/exporter.py'),
+                                   'infoflow.exporter.infoflow_export': ('exporter.html#infoflow_export', 'infoflow/exporter.py')},
+            'infoflow.importer': { 'infoflow.importer.ImportReport': ('importer.html#importreport', 'infoflow/importer.py'),
+                                   'infoflow.importer.ImportReport.__str__': ('importer.html#importreport.__str__', 'infoflow/importer.py'),
+                                   'infoflow.importer._chunks': ('importer.html#_chunks', 'infoflow/importer.py'),
+                                   'infoflow.importer._error': ('importer.html#_error', 'infoflow/importer.py'),
+                                   'infoflow.importer._insert_rows': ('importer.html#_insert_rows', 'infoflow/importer.py'),
+                                   'infoflow.importer._insert_sql': ('importer.html#_insert_sql', 'infoflow/importer.py'),
+                                   'infoflow.importer._validate_chunk': ('importer.html#_validate_chunk', 'infoflow/importer.py'),
+                                   'infoflow.importer._validated': ('importer.html#_validated', 'infoflow/importer.py'),
+                                   'infoflow.importer._write_batch': ('importer.html#_write_batch', 'infoflow/importer.py'),
+                                   'infoflow.importer.bulk_import': ('importer.html#bulk_import', 'infoflow/importer.py'),
+                                   'infoflow.importer.infoflow_import': ('importer.html#infoflow_import', 'infoflow/importer.py'),
+                                   'infoflow.importer.read_records': ('importer.html#read_records', 'infoflow/importer.py')},
+            'infoflow.layout': { 'infoflow.layout.LayeredGraph': ('layout.html#layeredgraph', 'infoflow/layout.py'),
+                                 'infoflow.layout.LayeredGraph._repr_image_svg_xml': ( 'layout.html#layeredgraph._repr_image_svg_xml',
+                                                                                       'infoflow/layout.py'),
+                                 'infoflow.layout.LayeredGraph._repr_svg_': ('layout.html#layeredgraph._repr_svg_', 'infoflow/layout.py'),
+                                 'infoflow.layout.LayeredGraph.layout': ('layout.html#layeredgraph.layout', 'infoflow/layout.py'),
+                                 'infoflow.layout.LayeredGraph.order': ('layout.html#layeredgraph.order', 'infoflow/layout.py'),
+                                 'infoflow.layout._node_size': ('layout.html#_node_size', 'infoflow/layout.py'),
+                                 'infoflow.layout._points': ('layout.html#_points', 'infoflow/layout.py'),
+                                 'infoflow.layout._svg_edge': ('layout.html#_svg_edge', 'infoflow/layout.py'),
+                                 'infoflow.layout._svg_node': ('layout.html#_svg_node', 'infoflow/layout.py')},
+            'infoflow.migrations': { 'infoflow.migrations._add_views_revision': ( 'migrations.html#_add_views_revision',
+                                                                                  'infoflow/migrations.py'),
+                                     'infoflow.migrations._backfill_phase_codes': ( 'migrations.html#_backfill_phase_codes',
+                                                                                    'infoflow/migrations.py'),
+                                     'infoflow.migrations._create_model_tables': ( 'migrations.html#_create_model_tables',
+                                                                                   'infoflow/migrations.py'),
+                                     'infoflow.migrations._create_revisions_table': ( 'migrations.html#_create_revisions_table',
+                                                                                      'infoflow/migrations.py'),
+                                     'infoflow.migrations._create_search_index': ( 'migrations.html#_create_search_index',
+                                                                                   'infoflow/migrations.py'),
+                                     'infoflow.migrations._create_toolflow_table': ( 'migrations.html#_create_toolflow_table',
+                                                                                     'infoflow/migrations.py'),
+                                     'infoflow.migrations._create_views_index': ( 'migrations.html#_create_views_index',
+                                                                                  'infoflow/migrations.py'),
+                                     'infoflow.migrations._create_views_table': ( 'migrations.html#_create_views_table',
+                                                                                  'infoflow/migrations.py'),
+                                     'infoflow.migrations._drop_toolflow_table': ( 'migrations.html#_drop_toolflow_table',
+                                                                                   'infoflow/migrations.py'),
+                                     'infoflow.migrations.migrate': ('migrations.html#migrate', 'infoflow/migrations.py'),
+                                     'infoflow.migrations.schema_version': ('migrations.html#schema_version', 'infoflow/migrations.py')},
+            'infoflow.phasetable': { 'infoflow.phasetable.PhaseTable': ('phasetable.html#phasetable', 'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.__init__': ( 'phasetable.html#phasetable.__init__',
+                                                                                  'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.__len__': ( 'phasetable.html#phasetable.__len__',
+                                                                                 'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.__repr__': ( 'phasetable.html#phasetable.__repr__',
+                                                                                  'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.at_least': ( 'phasetable.html#phasetable.at_least',
+                                                                                  'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.codes': ('phasetable.html#phasetable.codes', 'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.counts': ( 'phasetable.html#phasetable.counts',
+                                                                                'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.equals': ( 'phasetable.html#phasetable.equals',
+                                                                                'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.from_db': ( 'phasetable.html#phasetable.from_db',
+                                                                                 'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.from_models': ( 'phasetable.html#phasetable.from_models',
+                                                                                     'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.select': ( 'phasetable.html#phasetable.select',
+                                                                                'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.set': ('phasetable.html#phasetable.set', 'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.slugs': ('phasetable.html#phasetable.slugs', 'infoflow/phasetable.py'),
+                                     'infoflow.phasetable.PhaseTable.values': ( 'phasetable.html#phasetable.values',
+                                                                                'infoflow/phasetable.py'),
+                                     'infoflow.phasetable._shift': ('phasetable.html#_shift', 'infoflow/phasetable.py')},
+            'infoflow.render': { 'infoflow.render.DotPool': ('render.html#dotpool', 'infoflow/render.py'),
+                                 'infoflow.render.DotPool.__init__': ('render.html#dotpool.__init__', 'infoflow/render.py'),
+                                 'infoflow.render.DotPool.close': ('render.html#dotpool.close', 'infoflow/render.py'),
+                                 'infoflow.render.DotPool.render': ('render.html#dotpool.render', 'infoflow/render.py'),
+                                 'infoflow.render.DotPool.start': ('render.html#dotpool.start', 'infoflow/render.py'),
+                                 'infoflow.render.DotWorker': ('render.html#dotworker', 'infoflow/render.py'),
+                                 'infoflow.render.DotWorker.__init__': ('render.html#dotworker.__init__', 'infoflow/render.py'),
+                                 'infoflow.render.DotWorker.close': ('render.html#dotworker.close', 'infoflow/render.py'),
+                                 'infoflow.render.DotWorker.render': ('render.html#dotworker.render', 'infoflow/render.py'),
+                                 'infoflow.render.PooledGraph': ('render.html#pooledgraph', 'infoflow/render.py'),
+                                 'infoflow.render.PooledGraph.__getattr__': ('render.html#pooledgraph.__getattr__', 'infoflow/render.py'),
+                                 'infoflow.render.PooledGraph.__init__': ('render.html#pooledgraph.__init__', 'infoflow/render.py'),
+                                 'infoflow.render.PooledGraph._repr_image_svg_xml': ( 'render.html#pooledgraph._repr_image_svg_xml',
+                                                                                      'infoflow/render.py'),
+                                 'infoflow.render.PooledGraph._repr_svg_': ('render.html#pooledgraph._repr_svg_', 'infoflow/render.py'),
+                                 'infoflow.render.RenderCache': ('render.html#rendercache', 'infoflow/render.py'),
+                                 'infoflow.render.RenderCache.__contains__': ('render.html#rendercache.__contains__', 'infoflow/render.py'),
+                                 'infoflow.render.RenderCache.__init__': ('render.html#rendercache.__init__', 'infoflow/render.py'),
+                                 'infoflow.render.RenderCache.__len__': ('render.html#rendercache.__len__', 'infoflow/render.py'),
+                                 'infoflow.render.RenderCache.clear': ('render.html#rendercache.clear', 'infoflow/render.py'),
+                                 'infoflow.render.RenderCache.get': ('render.html#rendercache.get', 'infoflow/render.py'),
+                                 'infoflow.render.RenderCache.get_or_render': ( 'render.html#rendercache.get_or_render',
+                                                                                'infoflow/render.py'),
+                                 'infoflow.render.RenderCache.set': ('render.html#rendercache.set', 'infoflow/render.py'),
+                                 'infoflow.render.RenderCoordinator': ('render.html#rendercoordinator', 'infoflow/render.py'),
+                                 'infoflow.render.RenderCoordinator.__init__': ( 'render.html#rendercoordinator.__init__',
+                                                                                 'infoflow/render.py'),
+                                 'infoflow.render.RenderCoordinator.render': ('render.html#rendercoordinator.render', 'infoflow/render.py'),
+                                 'infoflow.render._flat': ('render.html#_flat', 'infoflow/render.py'),
+                                 'infoflow.render._flats': ('render.html#_flats', 'infoflow/render.py'),
+                                 'infoflow.render.viz_key': ('render.html#viz_key', 'infoflow/render.py')},
+            'infoflow.search': { 'infoflow.search.SearchHit': ('search.html#searchhit', 'infoflow/search.py'),
+                                 'infoflow.search._triggers': ('search.html#_triggers', 'infoflow/search.py'),
+                                 'infoflow.search.create_search_index': ('search.html#create_search_index', 'infoflow/search.py'),
+                                 'infoflow.search.fts_query': ('search.html#fts_query', 'infoflow/search.py'),
+                                 'infoflow.search.search': ('search.html#search', 'infoflow/search.py')},
+            'infoflow.startup': { 'infoflow.startup.check_import_budgets': ('startup.html#check_import_budgets', 'infoflow/startup.py'),
+                                  'infoflow.startup.import_time': ('startup.html#import_time', 'infoflow/startup.py'),
+                                  'infoflow.startup.infoflow_import_budget': ( 'startup.html#infoflow_import_budget',
+                                                                               'infoflow/startup.py')},
+            'infoflow.views': { 'infoflow.views.RenderedView': ('views.html#renderedview', 'infoflow/views.py'),
+                                'infoflow.views.ViewIndex': ('views.html#viewindex', 'infoflow/views.py'),
+                                'infoflow.views.ViewIndex.__init__': ('views.html#viewindex.__init__', 'infoflow/views.py'),
+                                'infoflow.views.ViewIndex._changed': ('views.html#viewindex._changed', 'infoflow/views.py'),
+                                'infoflow.views.ViewIndex._tool_views': ('views.html#viewindex._tool_views', 'infoflow/views.py'),
+                                'infoflow.views.ViewIndex.add_item': ('views.html#viewindex.add_item', 'infoflow/views.py'),
+                                'infoflow.views.ViewIndex.add_tool': ('views.html#viewindex.add_tool', 'infoflow/views.py'),
+                                'infoflow.views.ViewIndex.version': ('views.html#viewindex.version', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore': ('views.html#viewstore', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.__init__': ('views.html#viewstore.__init__', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore._render': ('views.html#viewstore._render', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore._run': ('views.html#viewstore._run', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.clear': ('views.html#viewstore.clear', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.close': ('views.html#viewstore.close', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.drop': ('views.html#viewstore.drop', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.get': ('views.html#viewstore.get', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.join': ('views.html#viewstore.join', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.keys': ('views.html#viewstore.keys', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.pending': ('views.html#viewstore.pending', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.refresh': ('views.html#viewstore.refresh', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.start': ('views.html#viewstore.start', 'infoflow/views.py'),
+                                'infoflow.views.ViewStore.stored': ('views.html#viewstore.stored', 'infoflow/views.py'),
+                                'infoflow.views.create_views_index': ('views.html#create_views_index', 'infoflow/views.py'),
+                                'infoflow.views.create_views_table': ('views.html#create_views_table', 'infoflow/views.py'),
+                                'infoflow.views.view_key': ('views.html#view_key', 'infoflow/views.py'),
+                                'infoflow.views.view_keys': ('views.html#view_keys', 'infoflow/views.py'),
+                                'infoflow.views.views_version': ('views.html#views_version', 'infoflow/views.py')},
+            'infoflow.viz': { 'infoflow.viz._digraph': ('create_vizualisation.html#_digraph', 'infoflow/viz.py'),
+                              'infoflow.viz._flow_edges': ('create_vizualisation.html#_flow_edges', 'infoflow/viz.py'),
+                              'infoflow.viz._group_label': ('create_vizualisation.html#_group_label', 'infoflow/viz.py'),
+                              'infoflow.viz._items_and_tools': ('create_vizualisation.html#_items_and_tools', 'infoflow/viz.py'),
+                              'infoflow.viz._tool_ranks': ('create_vizualisation.html#_tool_ranks', 'infoflow/viz.py'),
+                              'infoflow.viz.build_graphiz_from_intances': ( 'create_vizualisation.html#build_graphiz_from_intances',
                                                                             'infoflow/viz.py'),
                               'infoflow.viz.create_workflow_viz': ('create_vizualisation.html#create_workflow_viz', 'infoflow/viz.py'),
                               'infoflow.viz.get_info_items_for_tool': ( 'create_vizualisation.html#get_info_items_for_tool',
-                                                                        'infoflow/viz.py')},
-            'infoflow.webapp': { 'infoflow.webapp.add_onclick_to_nodes': ('create_webapp.html#add_onclick_to_nodes', 'infoflow/webapp.py'),
-                                 'infoflow.webapp.dict_svgnodes': ('create_webapp.html#dict_svgnodes', 'infoflow/webapp.py')}}}
+                                                                        'infoflow/viz.py'),
+                              'infoflow.viz.group_items': ('create_vizualisation.html#group_items', 'infoflow/viz.py'),
+                              'infoflow.viz.group_members': ('create_vizualisation.html#group_members', 'infoflow/viz.py'),
+                              'infoflow.viz.grouped_ranks': ('create_vizualisation.html#grouped_ranks', 'infoflow/viz.py'),
+                              'infoflow.viz.toolflow_signature': ('create_vizualisation.html#toolflow_signature', 'infoflow/viz.py'),
+                              'infoflow.viz.workflow_ranks': ('create_vizualisation.html#workflow_ranks', 'infoflow/viz.py')},
+            'infoflow.webapp': { 'infoflow.webapp.ConditionalGet': ('create_webapp.html#conditionalget', 'infoflow/webapp.py'),
+                                 'infoflow.webapp.ConditionalGet.__call__': ( 'create_webapp.html#conditionalget.__call__',
+                                                                              'infoflow/webapp.py'),
+                                 'infoflow.webapp.ConditionalGet.__init__': ( 'create_webapp.html#conditionalget.__init__',
+                                                                              'infoflow/webapp.py'),
+                                 'infoflow.webapp.ConditionalGet.tag': ('create_webapp.html#conditionalget.tag', 'infoflow/webapp.py'),
+                                 'infoflow.webapp.DbExecutor': ('create_webapp.html#dbexecutor', 'infoflow/webapp.py'),
+                                 'infoflow.webapp.DbExecutor.__init__': ('create_webapp.html#dbexecutor.__init__', 'infoflow/webapp.py'),
+                                 'infoflow.webapp.DbExecutor._submit': ('create_webapp.html#dbexecutor._submit', 'infoflow/webapp.py'),
+                                 'infoflow.webapp.DbExecutor.close': ('create_webapp.html#dbexecutor.close', 'infoflow/webapp.py'),
+                                 'infoflow.webapp.DbExecutor.run': ('create_webapp.html#dbexecutor.run', 'infoflow/webapp.py'),
+                                 'infoflow.webapp.DbExecutor.write': ('create_webapp.html#dbexecutor.write', 'infoflow/webapp.py'),
+                                 'infoflow.webapp.GraphLinkHandler': ('create_webapp.html#graphlinkhandler', 'infoflow/webapp.py'),
+                                 'infoflow.webapp.RegistryScope': ('create_webapp.html#registryscope', 'infoflow/webapp.py'),
+                                 'infoflow.webapp.RegistryScope.__call__': ( 'create_webapp.html#registryscope.__call__',
+                                                                             'infoflow/webapp.py'),
+                                 'infoflow.webapp.RegistryScope.__init__': ( 'create_webapp.html#registryscope.__init__',
+                                                                             'infoflow/webapp.py')}}}
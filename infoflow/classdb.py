@@ -5,18 +5,106 @@
 # %% ../nbs/00_classes_db.ipynb #cc9da8cc
 from __future__ import annotations
 import json
+import apsw
+import threading
 from enum import Enum
+from functools import cache, lru_cache
 from typing import Union, ClassVar
-from dataclasses import dataclass
-from pydantic import BaseModel, field_serializer, field_validator, Field, computed_field
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+import weakref
+from dataclasses import dataclass, asdict
+from pydantic import BaseModel, ConfigDict, field_serializer, field_validator, Field, computed_field
 from fastlite import *
-from fastcore.test import *
 from hopsa import ossys
 
 # %% auto #0
-__all__ = ['InformationType', 'Method', 'Phase', 'PhaseQuality', 'OrganizationSystem', 'SluggedModel', 'PhaseQualityData', 'Tool',
-           'PhaseMethodData', 'PhaseToolflowData', 'InformationItem', 'Improvement', 'create_db',
-           'create_tables_from_pydantic', 'dict_from_db']
+__all__ = ['REGISTRY_MAXSIZE', 'PHASE_BITS', 'PHASE_MASK', 'CONNECTION_PROFILES', 'ImprovementCursor', 'Registry', 'registry',
+           'registry_scope', 'InformationType', 'Method', 'Phase', 'PhaseQuality', 'OrganizationSystem', 'SluggedModel',
+           'PackedPhases', 'PhaseQualityData', 'Tool', 'PhaseMethodData', 'PhaseToolflowData', 'InformationItem',
+           'Improvement', 'ConnectionProfile', 'create_db', 'use_profile', 'ConnectionPool', 'write_transaction',
+           'create_tables_from_pydantic', 'DuplicateSlugError', 'upsert_model', 'backfill_phase_codes', 'LazyModel',
+           'dict_from_db', 'ToolflowIndex', 'create_revisions_table', 'db_revision', 'Repository',
+           'improvements_for_tool', 'improvements_by_tool']
+
+# %% ../nbs/00_classes_db.ipynb #d367f9b1
+REGISTRY_MAXSIZE = 10_000 # Max instances per model class kept in the process-wide registry
+
+class Registry(MutableMapping):
+    "Thread-safe `slug -> instance` mapping that keeps at most `maxsize` instances, dropping the least recently used slugs first, or weak references if `maxsize` is None. Lookups fall back to `parent`."
+    def __init__(self, maxsize: int | None = REGISTRY_MAXSIZE, parent: Registry | None = None):
+        self.maxsize,self.parent = maxsize,parent
+        self._d = weakref.WeakValueDictionary() if maxsize is None else {}
+        self._used = None if maxsize is None else OrderedDict() # Slugs from least to most recently used, iteration keeps the order of registration
+        self._lock = threading.RLock()
+
+    def _touch(self, slug):
+        if self._used is not None: self._used[slug] = None; self._used.move_to_end(slug)
+
+    def __setitem__(self, slug, inst):
+        with self._lock:
+            self._d[slug] = inst
+            self._touch(slug)
+            if self.maxsize is None: return
+            while len(self._d) > self.maxsize: del self._d[self._used.popitem(last=False)[0]]
+
+    def __getitem__(self, slug):
+        with self._lock:
+            if slug in self._d: self._touch(slug); return self._d[slug]
+        if self.parent is None: raise KeyError(slug)
+        return self.parent[slug]
+
+    def __contains__(self, slug):
+        with self._lock:
+            if slug in self._d: return True
+        return self.parent is not None and slug in self.parent
+
+    def __delitem__(self, slug):
+        with self._lock:
+            del self._d[slug]
+            if self._used is not None: self._used.pop(slug, None)
+
+    def pop(self, slug, *default):
+        "Remove `slug` from this registry (never from `parent`)."
+        with self._lock:
+            if self._used is not None: self._used.pop(slug, None)
+            return self._d.pop(slug, *default)
+
+    def _own(self) -> dict:
+        with self._lock: return dict(self._d.items())
+
+    def _all(self) -> dict:
+        return {**self.parent._all(), **self._own()} if self.parent is not None else self._own()
+
+    def __iter__(self): return iter(list(self._all()))
+    def __len__(self): return len(self._all())
+    def keys(self): return list(self._all())
+    def values(self): return list(self._all().values())
+    def items(self): return list(self._all().items())
+    def __repr__(self): return f"{type(self).__name__}({len(self)} instances, maxsize={self.maxsize})"
+
+# %% ../nbs/00_classes_db.ipynb #52b77ae1
+_global_registries: dict[type, Registry] = {}
+_scoped_registries: ContextVar[dict | None] = ContextVar('_scoped_registries', default=None)
+
+def registry(model_class: type, scoped: bool = True) -> Registry:
+    "The instance registry of `model_class`: the one of the current `registry_scope` if `scoped`, otherwise the process-wide one."
+    glob = _global_registries.get(model_class)
+    if glob is None: glob = _global_registries.setdefault(model_class, Registry())
+    scope = _scoped_registries.get() if scoped else None
+    if scope is None: return glob
+    reg = scope.get(model_class)
+    if reg is None: reg = scope.setdefault(model_class, Registry(maxsize=None, parent=glob))
+    return reg
+
+@contextmanager
+def registry_scope():
+    "Register instances created inside this block in fresh weak registries that fall back to the process-wide ones."
+    token = _scoped_registries.set({})
+    try: yield
+    finally: _scoped_registries.reset(token)
 
 # %% ../nbs/00_classes_db.ipynb #a1b5b3cf
 class InformationType(Enum):
@@ -69,12 +157,52 @@ class SluggedModel(BaseModel):
     def slug(self) -> str:
         return ossys.sanitize_name(self.name)
 
+    def __init__(self, **data):
+        super().__init__(**data)
+        registry(type(self))[self.slug] = self
+
+    @classmethod
+    def get_instances(cls) -> Registry:
+        return registry(cls)
+
     @staticmethod
     def _fld(rec, name):
         return getattr(rec, name) if hasattr(rec, name) else rec[name]
 
+# %% ../nbs/00_classes_db.ipynb #fa6bb9bb
+PHASE_BITS = 2 # Bits per phase in a packed code, enough for 4 values
+PHASE_MASK = (1 << PHASE_BITS) - 1
+
+class PackedPhases(BaseModel):
+    """Base class for a model with one enum value per `Phase` that packs into a single integer."""
+    model_config = ConfigDict(frozen=True)
+    _codes: ClassVar[list] = [] # The value for every code, e.g. `_codes[2]` is the value with code 2
+
+    @classmethod
+    def code(cls, v) -> int:
+        "Code of the value `v` of a phase."
+        return cls._codes.index(v)
+
+    @property
+    def packed(self) -> int:
+        "All phases packed in one integer, `PHASE_BITS` bits per phase in the order of `Phase`."
+        return sum(self.code(getattr(self, p.value)) << PHASE_BITS*i for i,p in enumerate(Phase))
+
+    @classmethod
+    @cache
+    def from_packed(cls, packed: int) -> PackedPhases:
+        "The (shared) instance for the code `packed`."
+        return cls(**{p.value: cls._codes[packed >> PHASE_BITS*i & PHASE_MASK] for i,p in enumerate(Phase)})
+
+    @classmethod
+    def packed_sql(cls, suffix: str) -> str:
+        "SQL expression that packs the text columns `{phase}_{suffix}` of a row like `packed` does."
+        def _case(p): return f'(CASE "{p.value}_{suffix}"' + ''.join(f" WHEN '{v.value}' THEN {i}" for i,v in enumerate(cls._codes) if v is not None) + ' ELSE 0 END)'
+        return ' + '.join(f'({_case(p)} << {PHASE_BITS*i})' for i,p in enumerate(Phase))
+
 # %% ../nbs/00_classes_db.ipynb #c11774e0
-class PhaseQualityData(BaseModel):
+class PhaseQualityData(PackedPhases):
+    _codes: ClassVar[list] = list(PhaseQuality)
     collect: PhaseQuality = Field(PhaseQuality.NA)
     retrieve: PhaseQuality = Field(PhaseQuality.NA)
     consume: PhaseQuality = Field(PhaseQuality.NA)
@@ -98,16 +226,6 @@ class Tool(SluggedModel):
     extract: str | None = Field(default=None, description="Description how to use tool in extract phase")
     refine: str | None = Field(default=None, description="Description how to use tool in refine phase")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        type(self)._instances[self.slug] = self
-
-    _instances: ClassVar[Dict[str, "Tool"]] = {}
-
-    @classmethod
-    def get_instances(cls) -> Dict[str, "Tool"]:
-        return cls._instances
-
     def flatten_for_db(self):
         base = self.model_dump(exclude={'phase_quality', 'organization_system'})
         base.update(
@@ -116,7 +234,8 @@ class Tool(SluggedModel):
             'retrieve_quality': self.phase_quality.retrieve.value, 
             'consume_quality': self.phase_quality.consume.value, 
             'extract_quality': self.phase_quality.extract.value, 
-            'refine_quality': self.phase_quality.refine.value}
+            'refine_quality': self.phase_quality.refine.value,
+            'phase_quality_code': self.phase_quality.packed}
             )
         return base
 
@@ -140,6 +259,7 @@ class Tool(SluggedModel):
             consume_quality: str
             extract_quality: str
             refine_quality: str
+            phase_quality_code: int
         return Tools
     
     @classmethod
@@ -154,7 +274,8 @@ class Tool(SluggedModel):
         return cls(id=cls._fld(db_record, 'id'), name=cls._fld(db_record, 'name'), description=cls._fld(db_record, 'description'), organization_system=org_systems, phase_quality=phase_quality, collect=cls._fld(db_record, 'collect'), retrieve=cls._fld(db_record, 'retrieve'), consume=cls._fld(db_record, 'consume'), extract=cls._fld(db_record, 'extract'), refine=cls._fld(db_record, 'refine'))
 
 # %% ../nbs/00_classes_db.ipynb #212699cc
-class PhaseMethodData(BaseModel):
+class PhaseMethodData(PackedPhases):
+    _codes: ClassVar[list] = [None, *Method]
     collect: Method | None = Field(default=None)
     retrieve: Method | None = Field(default=None)
     consume: Method | None = Field(default=None)
@@ -162,6 +283,9 @@ class PhaseMethodData(BaseModel):
     refine: Method | None = Field(default=None)
 
 # %% ../nbs/00_classes_db.ipynb #228d3ea4
+# A toolflow names the same few tools over and over, so we cache their sanitized names
+_sanitize_tool = lru_cache(maxsize=4096)(ossys.sanitize_name)
+
 class PhaseToolflowData(BaseModel):
     collect: Union[str, tuple[str, ...], None] = Field(default=None)
     retrieve: Union[str, tuple[str, ...], None] = Field(default=None)
@@ -172,9 +296,9 @@ class PhaseToolflowData(BaseModel):
     @staticmethod
     def _san(v):
         if v is None: return None
-        if isinstance(v, str): return ossys.sanitize_name(v)
+        if isinstance(v, str): return _sanitize_tool(v)
         if isinstance(v, (list, tuple)):
-            return tuple([ossys.sanitize_name(i) for i in v])
+            return tuple([_sanitize_tool(i) for i in v])
     
     @field_validator('collect', 'retrieve', 'consume', 'extract', 'refine', mode='before')
     def _val(cls, v): return cls._san(v)
@@ -191,16 +315,6 @@ class InformationItem(SluggedModel):
     method: PhaseMethodData = Field(..., description="Methods used at each phase")
     toolflow: PhaseToolflowData = Field(..., description="Tools used for this item at each phase")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        type(self)._instances[self.slug] = self
-
-    @classmethod
-    def get_instances(cls) -> Dict[str, "InformationItem"]:
-        return cls._instances
-
-    _instances: ClassVar[Dict[str, "InformationItem"]] = {}
-
     def flatten_for_db(self):
         base = self.model_dump(exclude={'method', 'toolflow'})
         base.update(
@@ -209,6 +323,7 @@ class InformationItem(SluggedModel):
             'consume_method': self.method.consume.value if self.method.consume else None, 
             'extract_method': self.method.extract.value if self.method.extract else None, 
             'refine_method': self.method.refine.value if self.method.refine else None,
+            'method_code': self.method.packed,
             'collect_toolflow': json.dumps(self.toolflow.collect) if isinstance(self.toolflow.collect, (list, tuple)) else self.toolflow.collect,
             'retrieve_toolflow': json.dumps(self.toolflow.retrieve) if isinstance(self.toolflow.retrieve, (list, tuple)) else self.toolflow.retrieve,
             'consume_toolflow': json.dumps(self.toolflow.consume) if isinstance(self.toolflow.consume, (list, tuple)) else self.toolflow.consume,
@@ -217,10 +332,6 @@ class InformationItem(SluggedModel):
             )
         return base
 
-    @classmethod
-    def get_instances(cls) -> Dict[str, InformationItem]:
-        return cls._instances
-    
     @classmethod
     def get_db_schema(cls):
         """Returns a dataclass with SQLite-compatible field types."""
@@ -240,6 +351,7 @@ class InformationItem(SluggedModel):
             consume_toolflow: str
             extract_toolflow: str
             refine_toolflow: str
+            method_code: int
         return InformationItems
 
     @field_serializer('info_type')
@@ -280,15 +392,7 @@ class Improvement(SluggedModel):
     tool: str = Field(..., description="slug of the Tool that needs improvement")
     phase: Phase = Field(..., description="Phase that needs improvement")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        type(self)._instances[self.slug] = self
-
-    @classmethod
-    def get_instances(cls) -> Dict[str, "Improvement"]:
-        return cls._instances
-
-    _instances: ClassVar[Dict[str, "Improvement"]] = {}
+    _db_indexes: ClassVar[list[list[str]]] = [['tool', 'prio']] # Extra (non unique) indexes created by `create_tables_from_pydantic`
 
     def flatten_for_db(self):
         return self.model_dump()
@@ -313,12 +417,6 @@ class Improvement(SluggedModel):
     def db_serialize(self, v):
         return v.value
     
-    @field_validator('tool')
-    def validate_tool_names(cls, v):
-        valid_tools = Tool.get_instances().keys()
-        if v not in valid_tools: raise ValueError(f"Tool '{v}' does not exist")
-        return v
-    
     @classmethod
     def from_db(cls, db_record):
         phase = Phase(cls._fld(db_record, 'phase'))
@@ -334,12 +432,99 @@ class Improvement(SluggedModel):
         )
 
 # %% ../nbs/00_classes_db.ipynb #f290176d
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """SQLite settings for a connection, each set with a `PRAGMA`. Settings that are `None` are left as they are."""
+    busy_timeout: int | None = None # Milliseconds to wait for a lock of another connection before failing with `BusyError`, set first so the other pragmas wait too
+    journal_mode: str | None = None # 'wal' lets readers go on while another connection writes, and it stays set for the file
+    synchronous: str | None = None # 'full' syncs every commit to disk, 'normal' is safe with WAL and syncs less, 'off' leaves it to the OS
+    mmap_size: int | None = None # Bytes of the database file to read through memory mapping instead of reads
+    cache_size: int | None = None # Pages in the page cache, or KiB when negative
+    temp_store: str | None = None # 'memory' keeps temporary tables and indexes, e.g. of sorts, in memory
+
+    def pragmas(self) -> dict:
+        """The pragmas this profile sets, with their values."""
+        return {k: v for k,v in asdict(self).items() if v is not None}
+
+    def apply(self, db: Database) -> Database:
+        """Set the pragmas of this profile on the connection of `db`."""
+        for k,v in self.pragmas().items(): db.execute(f"PRAGMA {k} = {v}").fetchall()
+        return db
+
+CONNECTION_PROFILES = dict(
+    default=ConnectionProfile(), # As `fastlite` opens a connection
+    dashboard=ConnectionProfile(busy_timeout=5_000, journal_mode='wal', synchronous='normal', mmap_size=256*2**20, cache_size=-64_000),
+    bulk_import=ConnectionProfile(busy_timeout=30_000, journal_mode='wal', synchronous='off', cache_size=-256_000, temp_store='memory'),
+)
+
+def _profile(profile: str | ConnectionProfile) -> ConnectionProfile:
+    if isinstance(profile, ConnectionProfile): return profile
+    if profile not in CONNECTION_PROFILES: raise ValueError(f"Unknown connection profile '{profile}', use one of {list(CONNECTION_PROFILES)}")
+    return CONNECTION_PROFILES[profile]
+
 def create_db(
-    loc: str = "../data/infoflow.db" # Location of the SQLite database
+    loc: str = "../data/infoflow.db", # Location of the SQLite database
+    profile: str | ConnectionProfile = 'default' # Name of a profile in `CONNECTION_PROFILES`, or a `ConnectionProfile`
 ) -> Database:
     db = database(loc)
     db.execute("PRAGMA foreign_keys = ON;")
-    return db
+    return _profile(profile).apply(db)
+
+# %% ../nbs/00_classes_db.ipynb #a8b9d164
+@contextmanager
+def use_profile(db: Database, profile: str | ConnectionProfile):
+    """Apply `profile` to the connection of `db` in the block, and restore the previous settings, except the journal mode, after it."""
+    profile = _profile(profile)
+    old = {k: db.execute(f"PRAGMA {k}").fetchone()[0] for k in profile.pragmas() if k != 'journal_mode'}
+    profile.apply(db)
+    try: yield db
+    finally:
+        for k,v in old.items(): db.execute(f"PRAGMA {k} = {v}").fetchall()
+
+# %% ../nbs/00_classes_db.ipynb #1773ed64
+class ConnectionPool:
+    """A connection to the database at `loc` for every thread, set up with `profile`. Attributes are those of the `Database` of the calling thread."""
+    def __init__(self,
+                 loc: str, # Location of the SQLite database file
+                 profile: str | ConnectionProfile = 'default'): # Profile of every connection, see `CONNECTION_PROFILES`
+        if not loc or loc == ':memory:': raise ValueError("An in-memory database can't be opened by more than one connection")
+        self.loc,self.profile = loc,_profile(profile)
+        self._local,self._lock,self._dbs = threading.local(),threading.Lock(),[]
+
+    @property
+    def db(self) -> Database:
+        """The connection of the calling thread, opened on first use."""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            # Opened one at a time: a new connection runs `PRAGMA optimize`, which fails on a lock of another new one
+            with self._lock: db = self._local.db = create_db(self.loc, self.profile); self._dbs.append(db)
+        return db
+
+    def connect(self) -> Database:
+        """A new connection with the profile of the pool that isn't bound to a thread, e.g. for a cursor that moves between threads. The caller closes it."""
+        with self._lock: return create_db(self.loc, self.profile)
+
+    def __getattr__(self, k): return getattr(self.db, k)
+    def __len__(self): return len(self._dbs)
+
+    def close(self):
+        """Close the connections of all threads."""
+        with self._lock:
+            for db in self._dbs: db.conn.close()
+            self._dbs.clear()
+            self._local = threading.local()
+
+# %% ../nbs/00_classes_db.ipynb #dca21e65
+@contextmanager
+def write_transaction(db: Database):
+    """Transaction on `db` that takes the write lock at the start, so it waits for other connections instead of failing after a read."""
+    if db.conn.in_transaction:
+        with db.conn: yield db
+        return
+    db.execute("BEGIN IMMEDIATE")
+    try: yield db
+    except BaseException: db.execute("ROLLBACK"); raise
+    else: db.execute("COMMIT")
 
 # %% ../nbs/00_classes_db.ipynb #b3a781a4
 def create_tables_from_pydantic(
@@ -347,16 +532,320 @@ def create_tables_from_pydantic(
     classes: List[BaseModel]) -> Tuple[Table, Table, Table]:
 
     for c in classes:
-        db.create(c.get_db_schema(), transform=True)
+        tbl = db.create(c.get_db_schema(), transform=True)
+        tbl.create_index(['slug'], unique=True, if_not_exists=True)
+        for cols in getattr(c, '_db_indexes', []): tbl.create_index(cols, if_not_exists=True)
+
+# %% ../nbs/00_classes_db.ipynb #23cbd85d
+class DuplicateSlugError(ValueError):
+    """Raised when saving a model would give two rows in a table the same slug."""
+
+def upsert_model(
+        table: Table, # Table created by `create_tables_from_pydantic`
+        model: SluggedModel # Inserted when it has no `id`, else updated
+    ) -> SluggedModel:
+    """Insert or update `model` in `table` in one statement, and set its `id`."""
+    rec = model.flatten_for_db()
+    if rec.get('id') is None: rec.pop('id', None)
+    cols = ', '.join(f'"{c}"' for c in rec)
+    upd = ', '.join(f'"{c}"=excluded."{c}"' for c in rec if c != 'id')
+    sql = f'INSERT INTO "{table.name}" ({cols}) VALUES ({", ".join("?"*len(rec))}) ON CONFLICT(id) DO UPDATE SET {upd} RETURNING id'
+    try: model.id = table.db.execute(sql, list(rec.values())).fetchone()[0]
+    except apsw.ConstraintError as e:
+        if '.slug' not in str(e): raise
+        raise DuplicateSlugError(f"'{model.name}' already exists. Please choose a different name.") from None
+    return model
+
+# %% ../nbs/00_classes_db.ipynb #7363d945
+_packed_columns = dict( # table -> (model field, packed class, suffix of the text columns, column of the packed code)
+    tools=('phase_quality', PhaseQualityData, 'quality', 'phase_quality_code'),
+    information_items=('method', PhaseMethodData, 'method', 'method_code'))
+
+def backfill_phase_codes(db: Database):
+    """Compute the missing packed codes in the `tools` and `information_items` tables from their text columns."""
+    for tbl,(_,cls,suffix,col) in _packed_columns.items():
+        if tbl in db.t: db.execute(f'UPDATE "{tbl}" SET "{col}" = {cls.packed_sql(suffix)} WHERE "{col}" IS NULL')
+
+# %% ../nbs/00_classes_db.ipynb #6da9f5e2
+_lazy_fields = {
+    Tool: dict(
+        organization_system=lambda r: [OrganizationSystem(s) for s in json.loads(r['organization_system'])],
+        phase_quality=lambda r: PhaseQualityData.from_packed(r['phase_quality_code']) if r.get('phase_quality_code') is not None else PhaseQualityData(**{p.value: PhaseQuality(r[f'{p.value}_quality']) for p in Phase})),
+    InformationItem: dict(
+        info_type=lambda r: InformationType(r['info_type']),
+        method=lambda r: PhaseMethodData.from_packed(r['method_code']) if r.get('method_code') is not None else PhaseMethodData(**{p.value: r[f'{p.value}_method'] for p in Phase}),
+        toolflow=lambda r: PhaseToolflowData(**{p.value: InformationItem._parse_toolflow(r[f'{p.value}_toolflow']) for p in Phase})),
+    Improvement: dict(phase=lambda r: Phase(r['phase'])),
+}
+
+class LazyModel:
+    """Read-only stand-in for a model of `model_class` that wraps its database `row` and decodes a field when it's first read."""
+    __slots__ = ('model_class', '_row', '_vals', '__weakref__')
+    def __init__(self, model_class: type[SluggedModel], row: dict):
+        self.model_class,self._row,self._vals = model_class,row,{}
+        registry(model_class)[row['slug']] = self
+
+    def __getattr__(self, name):
+        vals = self._vals
+        if name in vals: return vals[name]
+        dec = _lazy_fields.get(self.model_class, {}).get(name)
+        if dec is not None: v = dec(self._row)
+        elif name in self.model_class.model_fields or name == 'slug': v = self._row[name]
+        else: raise AttributeError(f"'{self.model_class.__name__}' has no field '{name}'")
+        vals[name] = v
+        return v
+
+    def flatten_for_db(self) -> dict: return dict(self._row)
+    def to_model(self) -> SluggedModel: return self.model_class.from_db(self._row)
+    def __repr__(self): return f"{self.model_class.__name__}(lazy, slug={self._row['slug']!r})"
 
 # %% ../nbs/00_classes_db.ipynb #08491e0d
 def dict_from_db(
         db_table: Table,
-        class_table: BaseModel
-    ) -> dict[str, BaseModel]:
+        class_table: BaseModel,
+        lazy: bool = False # Wrap the rows in a `LazyModel` instead of hydrating them
+    ) -> dict[str, BaseModel | LazyModel]:
     """Converts a database table to a dictionary of pydantic models."""
+    if lazy: return {r['slug']: LazyModel(class_table, r) for r in db_table.rows}
     d = {}
     for t in db_table():
         slug = getattr(t, "slug") if hasattr(t, "slug") else t["slug"]
         d[slug] = class_table.from_db(t)
     return d
+
+# %% ../nbs/00_classes_db.ipynb #40996d51
+def _toolflow_slugs(item: InformationItem) -> dict[str, tuple[str, ...]]:
+    tf = item.toolflow
+    return {p.value: (v,) if isinstance(v, str) else tuple(v) for p in Phase if (v := getattr(tf, p.value)) is not None}
+
+class ToolflowIndex:
+    """Inverted index from tool slug to the `InformationItem`s using that tool per phase, and from tool slug to `Tool`."""
+    def __init__(self,
+                 items: dict[str, InformationItem] | list[InformationItem] | None = None, # Items to index
+                 tools: dict[str, Tool] | list[Tool] | None = None): # Tools to index
+        self.items,self.tools,self.by_tool,self._pos,self._n = {},{},{},{},0
+        for t in (tools.values() if isinstance(tools, Mapping) else tools or []): self.add_tool(t)
+        for i in (items.values() if isinstance(items, Mapping) else items or []): self.add_item(i)
+
+    def add_tool(self, tool: Tool, replaces: str | None = None):
+        """Add or update `tool`, removing the tool with slug `replaces` first."""
+        if replaces: self.tools.pop(replaces, None)
+        self.tools[tool.slug] = tool
+
+    def remove_item(self, slug: str):
+        """Remove the item with `slug` from the index."""
+        item = self.items.pop(slug, None)
+        if item is None: return
+        for phase,ts in _toolflow_slugs(item).items():
+            for t in ts: self.by_tool.get(t, {}).get(phase, {}).pop(slug, None)
+
+    def add_item(self, item: InformationItem, replaces: str | None = None):
+        """Add or update `item`, removing the item with slug `replaces` first."""
+        pos = self._pos.get(replaces or item.slug)
+        if replaces: self.remove_item(replaces)
+        self.remove_item(item.slug)
+        if pos is None: pos,self._n = self._n,self._n+1
+        self.items[item.slug],self._pos[item.slug] = item,pos
+        for phase,ts in _toolflow_slugs(item).items():
+            for t in ts: self.by_tool.setdefault(t, {}).setdefault(phase, {})[item.slug] = item
+
+    def items_for_tool(self,
+                       tool_slug: str, # Slug of the tool
+                       phase: str | None = None # Only the items that use the tool in this phase
+                      ) -> dict[str, InformationItem]:
+        """Items that use the tool `tool_slug`, in any phase or in `phase`, in the order they were added."""
+        phases = self.by_tool.get(tool_slug.lower(), {})
+        found = phases.get(phase, {}) if phase else {k: v for d in phases.values() for k,v in d.items()}
+        return dict(sorted(found.items(), key=lambda o: self._pos[o[0]]))
+
+    def tool(self, slug: str) -> Tool | None: return self.tools.get(slug)
+
+# %% ../nbs/00_classes_db.ipynb #c722c809
+_revised_tables = dict(tools=('tools', Tool), information_items=('items', InformationItem), improvements=('improvements', Improvement)) # Table: attribute of the `Repository`, model
+
+def create_revisions_table(db: Database):
+    """Create the `revisions` table, with the triggers that add a row to it for every change of the tables of the models in `db`."""
+    existing = {r[0] for r in db.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+    trigs = {f"{tbl}_revised_{op}": (tbl, op) for tbl in _revised_tables if tbl in existing for op in ('insert', 'update', 'delete')}
+    if 'revisions' in existing and all(t in existing for t in trigs): return
+    with write_transaction(db):
+        db.execute("CREATE TABLE IF NOT EXISTS revisions (id INTEGER PRIMARY KEY AUTOINCREMENT, tbl TEXT NOT NULL, row_id INTEGER NOT NULL)")
+        for name,(tbl,op) in trigs.items():
+            row = 'old' if op == 'delete' else 'new'
+            db.execute(f"""CREATE TRIGGER IF NOT EXISTS "{name}" AFTER {op.upper()} ON "{tbl}" BEGIN INSERT INTO revisions (tbl, row_id) VALUES ('{tbl}', {row}.id); END""")
+
+def db_revision(db: Database) -> int:
+    """The revision of the data in `db`: the `id` of the last row in the `revisions` table, or 0."""
+    return db.execute("SELECT max(id) FROM revisions").fetchone()[0] or 0
+
+# %% ../nbs/00_classes_db.ipynb #1bd033d7
+def _replaced(models: dict[str, SluggedModel], *changed: SluggedModel) -> dict[str, SluggedModel]:
+    "Copy of `models` in which the models with the `id`s of the `changed` models are replaced by them, or with them added."
+    by_id,new = {m.id: m for m in changed},{}
+    for k,v in models.items():
+        m = by_id.pop(v.id, v) if v.id is not None else v
+        new[k if m is v else m.slug] = m
+    for m in by_id.values(): new[m.slug] = m
+    return new
+
+class Repository:
+    """Write-through in-memory store of the hydrated `Tool`s, `InformationItem`s and `Improvement`s in `db`."""
+    keep_revisions = 10_000 # Rows of the `revisions` table kept after a save, enough for the other processes to catch up
+
+    def __init__(self,
+                 db: Database,
+                 indexes: dict[str, type] | None = None): # Extra indexes like `ToolflowIndex`, built from the items and tools and updated on every save
+        self.db,self._lock,self.revision,self.db_revision = db,threading.Lock(),0,0
+        self._index_types = dict(toolflow=ToolflowIndex, **(indexes or {}))
+        self.load()
+
+    @property
+    def toolflow(self) -> ToolflowIndex: return self.indexes['toolflow']
+
+    def load(self):
+        """(Re)load all models from the database."""
+        with self._lock: self._load()
+
+    def _load(self):
+        # One read transaction, so the models are those of `db_revision`
+        with self.db.conn:
+            self.db_revision = db_revision(self.db)
+            self.tools = dict_from_db(self.db.t.tools, Tool, lazy=True)
+            self.items = dict_from_db(self.db.t.information_items, InformationItem, lazy=True)
+            self.improvements = dict_from_db(self.db.t.improvements, Improvement, lazy=True)
+        self.indexes = {k: cls(self.items, self.tools) for k,cls in self._index_types.items()}
+        for models in (self.tools, self.items, self.improvements): self._register(*models.values())
+        self.revision += 1
+
+    @staticmethod
+    def _register(*models, replaces: str | None = None):
+        # Models loaded or saved inside a `registry_scope` (a web request) must outlive it, so they go to the process-wide registry
+        for m in models:
+            reg = registry(m.model_class if isinstance(m, LazyModel) else type(m), scoped=False)
+            if replaces is not None and replaces != m.slug: reg.pop(replaces, None)
+            reg[m.slug] = m
+
+    def _write(self, f, *args):
+        # The revisions of our own write don't need a `sync`, unless another process wrote after the last one
+        with write_transaction(self.db):
+            seen = db_revision(self.db) == self.db_revision
+            res = f(*args)
+            rev = db_revision(self.db)
+            self.db.execute("DELETE FROM revisions WHERE id <= ?", [rev - self.keep_revisions])
+        if seen: self.db_revision = rev
+        return res
+
+    def _changed(self, max_changes: int) -> dict[str, list[LazyModel]] | None:
+        # The changed rows since `db_revision` by table, or None if they can't all be found or are too many
+        with self.db.conn:
+            first,last = self.db.execute("SELECT min(id), max(id) FROM revisions").fetchone()
+            if last is None or last <= self.db_revision: return {}
+            if first > self.db_revision + 1 or last - self.db_revision > max_changes: return None
+            ids = {}
+            for tbl,row_id in self.db.execute("SELECT tbl, row_id FROM revisions WHERE id > ?", [self.db_revision]): ids.setdefault(tbl, set()).add(row_id)
+            changed = {tbl: [LazyModel(cls, r) for r in self.db.q(f'SELECT * FROM "{tbl}" WHERE id IN ({", ".join("?"*len(ids[tbl]))})', list(ids[tbl]))]
+                       for tbl,(_,cls) in _revised_tables.items() if tbl in ids}
+            self.db_revision = last
+        # The indexes can't remove a model, so a deleted one means a reload
+        for tbl,ms in changed.items():
+            deleted = ids[tbl] - {m.id for m in ms}
+            if any(m.id in deleted for m in getattr(self, _revised_tables[tbl][0]).values()): return None
+        return changed
+
+    def sync(self,
+             max_changes: int = 1000 # Above this many changed rows everything is reloaded
+            ) -> bool:
+        """Update the models in memory with the changes that other processes made to the database since the last load, sync or save. Returns whether anything changed."""
+        if db_revision(self.db) <= self.db_revision: return False
+        with self._lock:
+            changed = self._changed(max_changes)
+            if changed is None: self._load(); return True
+            if not changed: return False
+            for tbl,ms in changed.items():
+                attr = _revised_tables[tbl][0]
+                models = getattr(self, attr)
+                slugs = {m.id: k for k,m in models.items()}
+                setattr(self, attr, _replaced(models, *ms))
+                for m in ms:
+                    old = slugs.get(m.id)
+                    for idx in (self.indexes.values() if attr != 'improvements' else ()):
+                        if attr == 'tools': idx.add_tool(m, replaces=old)
+                        else: idx.add_item(m, replaces=old)
+                    self._register(m, replaces=old)
+            self.revision += 1
+        return True
+
+    def save_tool(self, tool: Tool) -> Tool:
+        """Insert or update `tool` in the database and in memory."""
+        self.sync()
+        with self._lock:
+            old = next((k for k,v in self.tools.items() if tool.id is not None and v.id == tool.id), None)
+            self._write(upsert_model, self.db.t.tools, tool)
+            self.tools = _replaced(self.tools, tool)
+            for idx in self.indexes.values(): idx.add_tool(tool, replaces=old)
+            self._register(tool, replaces=old)
+            self.revision += 1
+        return tool
+
+    def save_item(self, item: InformationItem) -> InformationItem:
+        """Insert or update `item` in the database and in memory."""
+        self.sync()
+        with self._lock:
+            old = next((k for k,v in self.items.items() if item.id is not None and v.id == item.id), None)
+            self._write(upsert_model, self.db.t.information_items, item)
+            self.items = _replaced(self.items, item)
+            for idx in self.indexes.values(): idx.add_item(item, replaces=old)
+            self._register(item, replaces=old)
+            self.revision += 1
+        return item
+
+    def save_improvement(self, imp: Improvement) -> Improvement:
+        """Insert or update `imp` in the database and in memory, if its tool exists."""
+        self.sync()
+        with self._lock:
+            # The repository has all tools, while the process-wide registry may have dropped some
+            if imp.tool not in self.tools: raise ValueError(f"Tool '{imp.tool}' does not exist")
+            self._write(upsert_model, self.db.t.improvements, imp)
+            self.improvements = _replaced(self.improvements, imp)
+            self._register(imp)
+            self.revision += 1
+        return imp
+
+    def improvement(self, id: int) -> Improvement | None:
+        """The improvement with `id`."""
+        return next((i for i in self.improvements.values() if i.id == id), None)
+
+# %% ../nbs/00_classes_db.ipynb #d8218a20
+ImprovementCursor = tuple[int, int] # (prio, id) of the last improvement on a page
+
+def _improvement_page(rows: list[dict], limit: int) -> tuple[list[LazyModel], ImprovementCursor | None]:
+    page = [LazyModel(Improvement, r) for r in rows[:limit]]
+    return page, ((page[-1].prio, page[-1].id) if len(rows) > limit else None)
+
+def improvements_for_tool(
+        db: Database,
+        tool: str, # Slug of the tool
+        after: ImprovementCursor | None = None, # Cursor returned with the previous page
+        limit: int = 20 # Improvements per page
+    ) -> tuple[list[LazyModel], ImprovementCursor | None]:
+    """A page of the improvements of `tool` ordered by prio, and the cursor of the next page."""
+    where,args = 'tool = ?',[tool]
+    if after is not None: where,args = where + ' AND (prio, id) > (?, ?)',args + list(after)
+    rows = db.q(f'SELECT * FROM improvements WHERE {where} ORDER BY prio, id LIMIT ?', args + [limit+1])
+    return _improvement_page(rows, limit)
+
+def improvements_by_tool(
+        db: Database,
+        limit: int = 20 # Improvements per tool
+    ) -> dict[str, tuple[list[LazyModel], ImprovementCursor | None]]:
+    """The first page of the improvements of every tool, keyed by tool slug."""
+    cols = ', '.join(f'i."{c}"' for c in db.t.improvements.columns_dict)
+    rows = db.q(f"""SELECT g.slug AS _tool, {cols} FROM tools g
+        LEFT JOIN improvements i ON i.id IN (SELECT id FROM improvements WHERE tool = g.slug ORDER BY prio, id LIMIT ?)
+        ORDER BY g.id, i.prio, i.id""", [limit+1])
+    groups = {}
+    for r in rows:
+        tool = r.pop('_tool')
+        groups.setdefault(tool, [])
+        if r['id'] is not None: groups[tool].append(r)
+    return {tool: _improvement_page(rs, limit) for tool,rs in groups.items()}
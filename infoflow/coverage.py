@@ -0,0 +1,132 @@
+"""This module finds the gaps in the workflow: which information types can't get through a phase with a good tool."""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/09_coverage.ipynb.
+
+# %% ../nbs/09_coverage.ipynb #7fafc2a1
+from __future__ import annotations
+from collections.abc import Mapping
+from dataclasses import dataclass
+import numpy as np
+from fastcore.basics import patch
+from .classdb import *
+from .classdb import _toolflow_slugs
+
+# %% auto #0
+__all__ = ['Coverage', 'GapReport']
+
+# %% ../nbs/09_coverage.ipynb #11410fa7
+_types,_phases = list(InformationType),list(Phase)
+_type_idx = {t: i for i,t in enumerate(_types)}
+_phase_idx = {p.value: i for i,p in enumerate(_phases)}
+_OK = PhaseQualityData.code(PhaseQuality.OK)
+
+class Coverage:
+    """Number of information items per `InformationType`, `Phase` and tool, with the quality of every tool per phase."""
+    def __init__(self,
+                 items: dict[str, InformationItem] | list[InformationItem] | None = None, # Items to count
+                 tools: dict[str, Tool] | list[Tool] | None = None): # Tools with their quality per phase
+        self.tool_slugs,self._tool_idx,self._items = [],{},{}
+        self.n_items = np.zeros(len(_types), dtype=np.int64)
+        self._counts = np.zeros((len(_types), len(_phases), 0), dtype=np.int64)
+        self._quality = np.zeros((0, len(_phases)), dtype=np.uint8)
+        self._known = np.zeros(0, dtype=bool)
+        for t in (tools.values() if isinstance(tools, Mapping) else tools or []): self.add_tool(t)
+        contribs = [self._contrib(i) for i in (items.values() if isinstance(items, Mapping) else items or [])]
+        self._items = dict(contribs)
+        np.add.at(self.n_items, np.array([t for _,(t,_) in contribs], dtype=np.intp), 1)
+        links = [(t,p,k) for _,(t,ls) in contribs for p,k in ls]
+        if links: np.add.at(self._counts, tuple(np.array(links, dtype=np.intp).T), 1)
+
+    def _tool(self, slug: str) -> int:
+        i = self._tool_idx.get(slug)
+        if i is not None: return i
+        i = len(self.tool_slugs)
+        if i == len(self._known):
+            extra = max(8, i)
+            self._counts = np.concatenate([self._counts, np.zeros((len(_types), len(_phases), extra), dtype=self._counts.dtype)], axis=2)
+            self._quality = np.concatenate([self._quality, np.zeros((extra, len(_phases)), dtype=np.uint8)])
+            self._known = np.concatenate([self._known, np.zeros(extra, dtype=bool)])
+        self.tool_slugs.append(slug)
+        self._tool_idx[slug] = i
+        return i
+
+    def _contrib(self, item: InformationItem) -> tuple[str, tuple[int, tuple[tuple[int, int], ...]]]:
+        links = dict.fromkeys((_phase_idx[p], self._tool(t)) for p,ts in _toolflow_slugs(item).items() for t in ts)
+        return item.slug, (_type_idx[item.info_type], tuple(links))
+
+    def _apply(self, contrib, n: int):
+        t,links = contrib
+        self.n_items[t] += n
+        if links:
+            p,k = np.array(links, dtype=np.intp).T
+            self._counts[t, p, k] += n
+
+    @property
+    def counts(self) -> np.ndarray: return self._counts[:, :, :len(self.tool_slugs)]
+    @property
+    def quality(self) -> np.ndarray: return self._quality[:len(self.tool_slugs)]
+    @property
+    def known(self) -> np.ndarray: return self._known[:len(self.tool_slugs)]
+
+    def add_tool(self, tool: Tool, replaces: str | None = None):
+        """Add or update the quality of `tool`. The tool with slug `replaces` is no longer known."""
+        if replaces and replaces != tool.slug and replaces in self._tool_idx:
+            j = self._tool_idx[replaces]
+            self._quality[j],self._known[j] = 0,False
+        i = self._tool(tool.slug)
+        self._quality[i] = [PhaseQualityData.code(getattr(tool.phase_quality, p.value)) for p in _phases]
+        self._known[i] = True
+
+    def remove_item(self, slug: str):
+        """Remove the counts of the item with `slug`."""
+        contrib = self._items.pop(slug, None)
+        if contrib is not None: self._apply(contrib, -1)
+
+    def add_item(self, item: InformationItem, replaces: str | None = None):
+        """Add or update the counts of `item`, removing the item with slug `replaces` first."""
+        if replaces: self.remove_item(replaces)
+        self.remove_item(item.slug)
+        slug,contrib = self._contrib(item)
+        self._items[slug] = contrib
+        self._apply(contrib, 1)
+
+# %% ../nbs/09_coverage.ipynb #c9f95ce9
+@dataclass
+class GapReport:
+    """The gaps in the coverage of the information types, see `Coverage.gaps`."""
+    n_items: np.ndarray # Number of items per type
+    served: np.ndarray # (types, phases): some item of the type has a tool for the phase
+    well_served: np.ndarray # (types, phases): some item of the type has a tool rated at least OK for the phase
+    no_tool: np.ndarray # (types, phases): the type has items, but none with a tool for the phase
+    weak_only: np.ndarray # (types, phases): the phase only has tools rated BAD or NA for it
+    no_refine: np.ndarray # (types,): the type has items, but none gets to the refine phase
+    uncovered_phases: np.ndarray # (phases,): no known tool is rated better than NA for the phase
+
+    @staticmethod
+    def pairs(mask: np.ndarray) -> list[tuple[InformationType, Phase]]:
+        "The `(type, phase)` pairs where the (types, phases) `mask` is true."
+        return [(_types[t], _phases[p]) for t,p in zip(*np.nonzero(mask))]
+
+    @property
+    def types_without_refine(self) -> list[InformationType]: return [_types[t] for t in np.flatnonzero(self.no_refine)]
+    @property
+    def phases_without_tool(self) -> list[Phase]: return [_phases[p] for p in np.flatnonzero(self.uncovered_phases)]
+
+@patch
+def gaps(self: Coverage) -> GapReport:
+    """The gaps in the coverage, see `GapReport`."""
+    used = self.counts > 0
+    served = used.any(axis=2)
+    well_served = (used & (self.quality.T >= _OK)[None]).any(axis=2)
+    present = (self.n_items > 0)[:, None]
+    return GapReport(n_items=self.n_items.copy(), served=served, well_served=well_served,
+                     no_tool=present & ~served, weak_only=served & ~well_served,
+                     no_refine=present[:, 0] & ~served[:, _phase_idx['refine']],
+                     uncovered_phases=~((self.quality > 0) & self.known[:, None]).any(axis=0))
+
+@patch
+def top_tools(self: Coverage, info_type: InformationType, phase: Phase, n: int = 3) -> list[tuple[str, int]]:
+    """The `n` tools used most for `phase` by the items of `info_type`, with their number of items."""
+    row = self.counts[_type_idx[info_type], _phase_idx[phase.value]]
+    top = np.argsort(-row, kind='stable')[:n]
+    return [(self.tool_slugs[k], int(row[k])) for k in top if row[k] > 0]
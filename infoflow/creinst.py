@@ -3,11 +3,14 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/01_create_instances.ipynb.
 
 # %% auto #0
-__all__ = ['tools_from_code', 'informationitems_from_code', 'db_from_instances']
+__all__ = ['tools_from_code', 'informationitems_from_code', 'db_from_instances', 'random_instances']
 
 # %% ../nbs/01_create_instances.ipynb #19efa09a
-from fasthtml.common import *
+import random
+from pathlib import Path
+from fastlite import Database
 from .classdb import *
+from .migrations import migrate
 
 # %% ../nbs/01_create_instances.ipynb #a63f1d61
 def tools_from_code():
@@ -263,7 +266,7 @@ def db_from_instances(
     ) -> Database | None:
     """Create a fresh database filled with all the instances created in this notebook."""
     db = create_db(db_loc)
-    create_tables_from_pydantic(db, [Tool, InformationItem, Improvement])
+    migrate(db)
     tools_from_code()
     informationitems_from_code()
     for t in toolclass.get_instances().values(): db.t.tools.insert(t.flatten_for_db())
@@ -272,3 +275,22 @@ def db_from_instances(
         db.close()
     else:
         return db
+
+# %% ../nbs/01_create_instances.ipynb #b1ee3655
+def random_instances(
+    n_items: int, # Number of InformationItems to create
+    n_tools: int = 20, # Number of Tools to create
+    seed: int = 42 # Seed for the random generator
+    ) -> tuple[dict[str, Tool], dict[str, InformationItem]]:
+    """Create `n_tools` random Tools and `n_items` random InformationItems that flow through them."""
+    rng,phases = random.Random(seed),[p.value for p in Phase]
+    tools = [Tool(id=i+1, name=f"Tool {i}", organization_system=[rng.choice(list(OrganizationSystem))],
+                  phase_quality=PhaseQualityData(**{p: rng.choice(list(PhaseQuality)) for p in phases})) for i in range(n_tools)]
+    slugs = [t.slug for t in tools]
+    def _tf():
+        r = rng.random()
+        return None if r < 0.3 else rng.choice(slugs) if r < 0.8 else tuple(rng.sample(slugs, min(2, n_tools)))
+    items = [InformationItem(id=i+1, name=f"Item {i}", info_type=rng.choice(list(InformationType)),
+                             method=PhaseMethodData(**{p: rng.choice(list(Method)) for p in phases}),
+                             toolflow=PhaseToolflowData(**{p: _tf() for p in phases})) for i in range(n_items)]
+    return {t.slug: t for t in tools}, {i.slug: i for i in items}
@@ -0,0 +1,66 @@
+"""This module streams the tools, information items and improvements from the database as JSONL or CSV."""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/07_exporter.ipynb.
+
+# %% auto #0
+__all__ = ['export_rows', 'export_lines', 'infoflow_export']
+
+# %% ../nbs/07_exporter.ipynb #8ba44dbe
+import csv, io, json, sys
+from fastcore.script import call_parse
+from fastlite import Database
+from .classdb import *
+
+# %% ../nbs/07_exporter.ipynb #ecd14afd
+_tables = dict(items='information_items', tools='tools', improvements='improvements')
+
+def _table(db: Database, kind: str):
+    if kind not in _tables: raise ValueError(f"Unknown kind '{kind}', use 'items', 'tools' or 'improvements'")
+    return db.t[_tables[kind]]
+
+def export_rows(
+    db: Database,
+    kind: str # 'items', 'tools' or 'improvements'
+):
+    """Yield the rows of the table of `kind` as dicts, straight from the database cursor."""
+    tbl = _table(db, kind)
+    cols = list(tbl.columns_dict)
+    sql = f'SELECT {", ".join(f"{chr(34)}{c}{chr(34)}" for c in cols)} FROM "{tbl.name}" ORDER BY id'
+    for row in db.conn.cursor().execute(sql): yield dict(zip(cols, row))
+
+# %% ../nbs/07_exporter.ipynb #1bff6325
+def _csv_lines(rows, cols):
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(cols)
+    for r in rows:
+        w.writerow(r.values())
+        yield buf.getvalue()
+        buf.seek(0); buf.truncate()
+    yield buf.getvalue()
+
+def export_lines(
+    db: Database,
+    kind: str, # 'items', 'tools' or 'improvements'
+    fmt: str = 'jsonl' # 'jsonl' or 'csv'
+):
+    """Generator with the lines of a JSONL or CSV file with all rows of the table of `kind`."""
+    if fmt not in ('jsonl', 'csv'): raise ValueError(f"Unknown format '{fmt}', use 'jsonl' or 'csv'")
+    cols,rows = list(_table(db, kind).columns_dict),export_rows(db, kind)
+    if fmt == 'csv': return _csv_lines(rows, cols)
+    return (json.dumps(r) + '\n' for r in rows)
+
+# %% ../nbs/07_exporter.ipynb #3a06715f
+@call_parse
+def infoflow_export(
+    kind: str, # 'items', 'tools' or 'improvements'
+    fmt: str = 'jsonl', # 'jsonl' or 'csv'
+    db: str = 'data/infoflow.db', # Location of the SQLite database
+    out: str = None # File to write to, by default the standard output
+):
+    "Export the information items, tools or improvements from the database as JSONL or CSV."
+    lines = export_lines(create_db(db), kind, fmt)
+    f = open(out, 'w', newline='', encoding='utf-8') if out else sys.stdout
+    try: f.writelines(lines)
+    finally:
+        if out: f.close()
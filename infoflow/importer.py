@@ -0,0 +1,143 @@
+"""This module loads large catalogues of information items and tools from JSONL or CSV files into the database."""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/06_importer.ipynb.
+
+# %% auto #0
+__all__ = ['read_records', 'ImportReport', 'bulk_import', 'infoflow_import']
+
+# %% ../nbs/06_importer.ipynb #d2a70ed5
+import csv, io, json, os, apsw
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from fastcore.script import call_parse
+from fastlite import Database
+from .classdb import *
+from .migrations import migrate
+
+# %% ../nbs/06_importer.ipynb #25f8f24b
+def read_records(
+    src: str | Path | io.TextIOBase, # Path of the file or an opened text file
+    fmt: str | None = None # 'jsonl' or 'csv', by default derived from the suffix of `src`
+):
+    """Yield `(line_number, record)` for every record in the JSONL or CSV file `src`."""
+    if fmt is None: fmt = Path(getattr(src, 'name', str(src))).suffix.lstrip('.').lower()
+    if fmt == 'ndjson': fmt = 'jsonl'
+    if fmt not in ('jsonl', 'csv'): raise ValueError(f"Unknown format '{fmt}', use 'jsonl' or 'csv'")
+    f = open(src, newline='', encoding='utf-8') if isinstance(src, (str, Path)) else src
+    try:
+        if fmt == 'csv':
+            rdr = csv.DictReader(f)
+            for rec in rdr: yield rdr.line_num, {k: v if v != '' else None for k,v in rec.items()}
+        else:
+            for i,l in enumerate(f, 1):
+                if l.strip(): yield i, l
+    finally:
+        if f is not src: f.close()
+
+# %% ../nbs/06_importer.ipynb #81f6e37a
+_kinds = dict(items=(InformationItem, 'information_items'), tools=(Tool, 'tools'))
+
+def _error(e: Exception) -> str: return f"{type(e).__name__}: {' '.join(str(e).split())}"
+
+def _validate_chunk(kind: str, chunk: list[tuple[int, dict | str]]) -> list[tuple[int, dict | None, str | None]]:
+    """Validate `chunk` into models of `kind` and return `(line_number, record, error)` for every record."""
+    cls,res = _kinds[kind][0],[]
+    with registry_scope():
+        for line,rec in chunk:
+            try:
+                if isinstance(rec, str): rec = json.loads(rec)
+                rec = defaultdict(lambda: None, {k: json.dumps(v) if isinstance(v, (list, tuple)) else v for k,v in rec.items()})
+                m = cls.from_db(rec)
+                flat = m.flatten_for_db()
+                if flat.get('id') is None: flat.pop('id', None)
+                res.append((line, flat, None))
+            except Exception as e: res.append((line, None, _error(e)))
+    return res
+
+# %% ../nbs/06_importer.ipynb #b4ae8e6c
+@dataclass
+class ImportReport:
+    kind: str # 'items' or 'tools'
+    inserted: int = 0 # Number of records written to the database
+    errors: list[tuple[int, str]] = field(default_factory=list) # Line number and error for every record that was skipped
+
+    def __str__(self): return f"Imported {self.inserted} {self.kind}, skipped {len(self.errors)}"
+
+def _validated(kind, chunks, workers):
+    if not workers:
+        for c in chunks: yield from _validate_chunk(kind, c)
+        return
+    from concurrent.futures import ProcessPoolExecutor # Only the parallel path needs `multiprocessing`
+    with ProcessPoolExecutor(workers) as ex:
+        pending = deque()
+        for c in chunks:
+            pending.append(ex.submit(_validate_chunk, kind, c))
+            if len(pending) >= 2*workers: yield from pending.popleft().result()
+        while pending: yield from pending.popleft().result()
+
+def _chunks(records, n):
+    chunk = []
+    for r in records:
+        chunk.append(r)
+        if len(chunk) == n: yield chunk; chunk = []
+    if chunk: yield chunk
+
+def _insert_sql(table, cols):
+    return f'INSERT INTO "{table}" ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in cols)}) VALUES ({", ".join("?"*len(cols))})'
+
+def _insert_rows(db, table, rows):
+    sqls = {}
+    for _,rec,_ in rows:
+        cols = tuple(rec)
+        if cols not in sqls: sqls[cols] = _insert_sql(table, cols)
+        db.conn.execute(sqls[cols], tuple(rec.values()))
+
+def _write_batch(db, table, rows, report):
+    try:
+        with db.conn: _insert_rows(db, table, rows)
+        report.inserted += len(rows)
+    except apsw.ConstraintError:
+        for r in rows:
+            try:
+                with db.conn: _insert_rows(db, table, [r])
+                report.inserted += 1
+            except apsw.ConstraintError as e: report.errors.append((r[0], _error(e)))
+
+def bulk_import(
+    db: Database, # Database with the tables created by `create_tables_from_pydantic`
+    src: str | Path | io.TextIOBase, # JSONL or CSV file to import
+    kind: str = 'items', # 'items' for `InformationItem`s, 'tools' for `Tool`s
+    fmt: str | None = None, # 'jsonl' or 'csv', by default derived from the suffix of `src`
+    workers: int | None = None, # Number of validating processes, 0 to validate in this process, by default the number of CPUs
+    batch_size: int = 5000, # Number of rows written per transaction
+    chunk_size: int = 1000 # Number of records validated per task
+) -> ImportReport:
+    """Validate and insert all records of `src` as `kind`, skipping and reporting the records that fail."""
+    if kind not in _kinds: raise ValueError(f"Unknown kind '{kind}', use 'items' or 'tools'")
+    if workers is None: workers = os.cpu_count() or 1
+    report,batch,table = ImportReport(kind),[],_kinds[kind][1]
+    for row in _validated(kind, _chunks(read_records(src, fmt), chunk_size), workers):
+        if row[2] is not None: report.errors.append((row[0], row[2])); continue
+        batch.append(row)
+        if len(batch) == batch_size: _write_batch(db, table, batch, report); batch = []
+    if batch: _write_batch(db, table, batch, report)
+    report.errors.sort()
+    return report
+
+# %% ../nbs/06_importer.ipynb #6c54a291
+@call_parse
+def infoflow_import(
+    path: str, # JSONL or CSV file to import
+    kind: str = 'items', # 'items' or 'tools'
+    db: str = 'data/infoflow.db', # Location of the SQLite database
+    fmt: str = None, # 'jsonl' or 'csv', by default derived from the suffix of `path`
+    workers: int = None, # Number of validating processes, by default the number of CPUs
+    batch_size: int = 5000 # Number of rows written per transaction
+):
+    "Import information items or tools from a JSONL or CSV file into the database."
+    database = create_db(db)
+    migrate(database)
+    report = bulk_import(database, path, kind, fmt=fmt, workers=workers, batch_size=batch_size)
+    for line,err in report.errors: print(f"line {line}: {err}")
+    print(report)
@@ -0,0 +1,96 @@
+"""This module lays out the workflow graph in ranks and renders it to `SVG` in pure Python, without the `dot` binary."""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_layout.ipynb.
+
+# %% auto #0
+__all__ = ['LayeredGraph']
+
+# %% ../nbs/05_layout.ipynb #6fe4ed1c
+from html import escape
+from dataclasses import dataclass, field
+from fastcore.basics import patch
+
+# %% ../nbs/05_layout.ipynb #394cc4d3
+_CW,_LH,_PAD,_NODESEP,_RANKSEP,_MARGIN = 7.5,18,12,18,54,4 # char width, line height, padding, spacing in pt
+
+def _node_size(n: dict) -> tuple[float, float]:
+    lines = n['label'].split('\n')
+    w = max(54, max(len(l) for l in lines)*_CW + 2*_PAD) + (24 if n['shape']=='hexagon' else 0)
+    return w, max(36, len(lines)*_LH + _PAD)
+
+# %% ../nbs/05_layout.ipynb #5ad2096e
+@dataclass
+class LayeredGraph:
+    """Graph with nodes in `ranks` from top to bottom and `edges` between node ids, rendered to SVG without graphviz."""
+    ranks: list[list[dict]] # Nodes per rank, every node is a dict with `id`, `label`, `shape` and `fillcolor`
+    edges: list[tuple[str, str]] = field(default_factory=list) # Edges as (from-id, to-id)
+    edge_labels: dict[tuple[str, str], str] = field(default_factory=dict) # Optional label per edge, e.g. the number of items along it
+    edge_color: str = 'lightblue'
+
+    def order(self) -> list[list[dict]]:
+        """Order the nodes in every rank on the barycenter of their predecessors, skipping empty ranks."""
+        preds,pos,res = {},{},[]
+        for a,b in self.edges: preds.setdefault(b, []).append(a)
+        for rank in (r for r in self.ranks if r):
+            if res:
+                def bary(i_n):
+                    ps = [pos[p] for p in preds.get(i_n[1]['id'], ()) if p in pos]
+                    return sum(ps)/len(ps) if ps else i_n[0]/len(rank)
+                rank = [n for _,n in sorted(enumerate(rank), key=bary)]
+            pos.update({n['id']: i/len(rank) for i,n in enumerate(rank)})
+            res.append(rank)
+        return res
+
+    def layout(self) -> tuple[dict[str, tuple[float, float, float, float]], float, float]:
+        """Center x, center y, width and height of every node, plus the total width and height of the graph."""
+        ranks = self.order()
+        sizes = [[_node_size(n) for n in r] for r in ranks]
+        widths = [sum(w for w,_ in s) + _NODESEP*(len(s)-1) for s in sizes]
+        heights = [max(h for _,h in s) for s in sizes]
+        W,boxes,y = max(widths, default=0), {}, 0.
+        for r,s,rw,rh in zip(ranks, sizes, widths, heights):
+            x = (W-rw)/2
+            for n,(w,h) in zip(r, s): boxes[n['id']] = (x+w/2, y+rh/2, w, h); x += w+_NODESEP
+            y += rh+_RANKSEP
+        return boxes, W, max(y-_RANKSEP, 0)
+
+# %% ../nbs/05_layout.ipynb #93adfea8
+def _points(shape: str, cx: float, cy: float, w: float, h: float) -> str:
+    if shape=='hexagon': pts = [(cx+w/2,cy), (cx+w/4,cy-h/2), (cx-w/4,cy-h/2), (cx-w/2,cy), (cx-w/4,cy+h/2), (cx+w/4,cy+h/2), (cx+w/2,cy)]
+    else:                pts = [(cx+w/2,cy-h/2), (cx-w/2,cy-h/2), (cx-w/2,cy+h/2), (cx+w/2,cy+h/2), (cx+w/2,cy-h/2)]
+    return ' '.join(f'{x:.2f},{y:.2f}' for x,y in pts)
+
+def _svg_node(i: int, n: dict, box: tuple) -> str:
+    cx,cy,w,h = box
+    lines = n['label'].split('\n')
+    y0 = cy - (len(lines)-1)*_LH/2 + 4.5
+    txt = ''.join(f'<text text-anchor="middle" x="{cx:.2f}" y="{y0+j*_LH:.2f}" font-family="Times,serif" font-size="14.00">{escape(l)}</text>' for j,l in enumerate(lines))
+    shape = f'<polygon fill="{n["fillcolor"]}" stroke="black" points="{_points(n["shape"], *box)}"/>{txt}'
+    if n.get('url'): shape = f'<g id="a_{escape(n["id"])}"><a xlink:href="{escape(n["url"])}" xlink:title="{escape(n["label"])}">{shape}</a></g>'
+    head = f'<g id="{escape(n["id"])}" class="node {n["cls"]}">' if n.get('cls') else f'<g id="node{i}" class="node">'
+    return f'{head}<title>{escape(n["id"])}</title>{shape}</g>'
+
+def _svg_edge(i: int, a: str, b: str, ba: tuple, bb: tuple, color: str, label=None) -> str:
+    x1,y1,x2,y2 = ba[0], ba[1]+ba[3]/2, bb[0], bb[1]-bb[3]/2-10
+    ym = (y1+y2)/2
+    head = f'{x2-3.5:.2f},{y2:.2f} {x2:.2f},{y2+10:.2f} {x2+3.5:.2f},{y2:.2f} {x2-3.5:.2f},{y2:.2f}'
+    return (f'<g id="edge{i}" class="edge"><title>{escape(a)}&#45;&gt;{escape(b)}</title>'
+            f'<path fill="none" stroke="{color}" d="M{x1:.2f},{y1:.2f}C{x1:.2f},{ym:.2f} {x2:.2f},{ym:.2f} {x2:.2f},{y2:.2f}"/>'
+            f'<polygon fill="{color}" stroke="{color}" points="{head}"/>'
+            + (f'<text text-anchor="middle" x="{(x1+x2)/2+6:.2f}" y="{ym:.2f}" font-family="Times,serif" font-size="14.00" fill="{color}">{escape(str(label))}</text>' if label is not None else '')
+            + '</g>')
+
+# %% ../nbs/05_layout.ipynb #3c82e68c
+@patch
+def _repr_image_svg_xml(self: LayeredGraph) -> str:
+    """Render the graph to an SVG string, the same method name `graphviz` uses, so both backends can be used alike."""
+    boxes,W,H = self.layout()
+    W,H = W+2*_MARGIN, H+2*_MARGIN
+    out = [f'<svg width="{W:.0f}pt" height="{H:.0f}pt" viewBox="0.00 0.00 {W:.2f} {H:.2f}" xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">',
+           f'<g id="graph0" class="graph" transform="translate({_MARGIN} {_MARGIN})">']
+    out += [_svg_edge(i, a, b, boxes[a], boxes[b], self.edge_color, self.edge_labels.get((a,b))) for i,(a,b) in enumerate(self.edges, 1)]
+    out += [_svg_node(i, n, boxes[n['id']]) for i,n in enumerate((n for r in self.ranks for n in r), 1)]
+    return '\n'.join(out + ['</g>', '</svg>'])
+
+@patch
+def _repr_svg_(self: LayeredGraph) -> str: return self._repr_image_svg_xml()
@@ -0,0 +1,130 @@
+"""This module keeps the schema of the database up to date with ordered migrations, and records the version of the schema in the database."""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/13_migrations.ipynb.
+
+# %% auto #0
+__all__ = ['MIGRATIONS', 'schema_version', 'migrate']
+
+# %% ../nbs/13_migrations.ipynb #6c514269
+import time
+from collections.abc import Callable
+from fastlite import Database
+from .classdb import *
+
+# %% ../nbs/13_migrations.ipynb #9b754027
+_phases = ('collect', 'retrieve', 'consume', 'extract', 'refine')
+# The model tables as they were at version 1, kept as they are when the models change
+_V1_TABLES = dict(
+    information_items=dict(id='INTEGER PRIMARY KEY', name='TEXT', info_type='TEXT', slug='TEXT', **{f'{p}_method': 'TEXT' for p in _phases},
+                           **{f'{p}_toolflow': 'TEXT' for p in _phases}, method_code='INTEGER'),
+    tools=dict(id='INTEGER PRIMARY KEY', name='TEXT', description='TEXT', **{p: 'TEXT' for p in _phases}, slug='TEXT', organization_system='TEXT',
+               **{f'{p}_quality': 'TEXT' for p in _phases}, phase_quality_code='INTEGER'),
+    improvements=dict(id='INTEGER PRIMARY KEY', name='TEXT', what='TEXT', why='TEXT', how='TEXT', prio='INTEGER', tool='TEXT', phase='TEXT', slug='TEXT'),
+)
+_V1_INDEXES = [
+    'CREATE UNIQUE INDEX IF NOT EXISTS "idx_information_items_slug" ON "information_items" ("slug")',
+    'CREATE UNIQUE INDEX IF NOT EXISTS "idx_tools_slug" ON "tools" ("slug")',
+    'CREATE UNIQUE INDEX IF NOT EXISTS "idx_improvements_slug" ON "improvements" ("slug")',
+    'CREATE INDEX IF NOT EXISTS "idx_improvements_tool_prio" ON "improvements" ("tool", "prio")',
+]
+
+def _create_model_tables(db: Database):
+    "The tables of the `Tool`s, `InformationItem`s and `Improvement`s with their indexes, or the columns an older table misses."
+    for tbl,cols in _V1_TABLES.items():
+        if tbl not in db.t: db.execute(f'CREATE TABLE "{tbl}" ({", ".join(f"{chr(34)}{c}{chr(34)} {t}" for c,t in cols.items())})')
+        else:
+            for c in cols.keys() - db.t[tbl].columns_dict.keys(): db.execute(f'ALTER TABLE "{tbl}" ADD COLUMN "{c}" {cols[c]}')
+    for sql in _V1_INDEXES: db.execute(sql)
+
+def _create_toolflow_table(db: Database):
+    "The `item_tool_phase` table of version 2, left empty because `_drop_toolflow_table` removes it."
+    db.execute('CREATE TABLE IF NOT EXISTS "item_tool_phase" ("item_id" INTEGER, "tool_slug" TEXT, "phase" TEXT, "position" INTEGER, PRIMARY KEY ("item_id", "phase", "position"))')
+    db.execute('CREATE INDEX IF NOT EXISTS "idx_item_tool_phase_tool_slug_phase" ON "item_tool_phase" ("tool_slug", "phase")')
+
+# The packed codes as they were at version 3: suffix of the text columns, column of the code, code of every text value
+_V3_CODES = dict(
+    tools=('quality', 'phase_quality_code', dict(na=0, bad=1, ok=2, great=3)),
+    information_items=('method', 'method_code', dict(na=1, manual=2, automatic=3)),
+)
+
+def _backfill_phase_codes(db: Database):
+    "The missing packed codes of the `tools` and `information_items`, computed from their text columns."
+    for tbl,(suffix,col,codes) in _V3_CODES.items():
+        cases = [f"""((CASE "{p}_{suffix}"{''.join(f" WHEN '{v}' THEN {c}" for v,c in codes.items())} ELSE 0 END) << {2*i})""" for i,p in enumerate(_phases)]
+        db.execute(f'UPDATE "{tbl}" SET "{col}" = {" + ".join(cases)} WHERE "{col}" IS NULL')
+
+# The searched columns as they were at version 4
+_V4_SEARCH = dict(tools=['name', 'description', *_phases], information_items=['name'], improvements=['name', 'what', 'why', 'how'])
+
+def _create_search_index(db: Database):
+    "The FTS5 tables of the searched columns, with the triggers that keep them in sync, filled from their tables."
+    for tbl,cols in _V4_SEARCH.items():
+        fts,names = f"{tbl}_fts",', '.join(cols)
+        new,old = ', '.join(f'new."{c}"' for c in cols),', '.join(f'old."{c}"' for c in cols)
+        ins = f'INSERT INTO "{fts}"(rowid, {names}) VALUES (new.id, {new});'
+        dele = f"""INSERT INTO "{fts}"("{fts}", rowid, {names}) VALUES ('delete', old.id, {old});"""
+        db.execute(f"""CREATE VIRTUAL TABLE IF NOT EXISTS "{fts}" USING fts5({names}, content='{tbl}', content_rowid='id', prefix='2 3')""")
+        db.execute(f"""INSERT INTO "{fts}"("{fts}", rank) VALUES ('rank', 'bm25({', '.join('10.0' if c == 'name' else '1.0' for c in cols)})')""")
+        db.execute(f'CREATE TRIGGER IF NOT EXISTS "{fts}_ai" AFTER INSERT ON "{tbl}" BEGIN {ins} END')
+        db.execute(f'CREATE TRIGGER IF NOT EXISTS "{fts}_ad" AFTER DELETE ON "{tbl}" BEGIN {dele} END')
+        db.execute(f'CREATE TRIGGER IF NOT EXISTS "{fts}_au" AFTER UPDATE ON "{tbl}" BEGIN {dele} {ins} END')
+        db.execute(f"""INSERT INTO "{fts}"("{fts}") VALUES ('rebuild')""")
+
+def _create_revisions_table(db: Database):
+    "The `revisions` table, with the triggers that add a row to it for every change of the model tables."
+    db.execute("CREATE TABLE IF NOT EXISTS revisions (id INTEGER PRIMARY KEY AUTOINCREMENT, tbl TEXT NOT NULL, row_id INTEGER NOT NULL)")
+    for tbl in ('tools', 'information_items', 'improvements'):
+        for op,row in (('insert', 'new'), ('update', 'new'), ('delete', 'old')):
+            db.execute(f"""CREATE TRIGGER IF NOT EXISTS "{tbl}_revised_{op}" AFTER {op.upper()} ON "{tbl}" BEGIN INSERT INTO revisions (tbl, row_id) VALUES ('{tbl}', {row}.id); END""")
+
+def _create_views_table(db: Database):
+    "The `rendered_views` table of the `ViewStore`."
+    db.execute('CREATE TABLE IF NOT EXISTS "rendered_views" ("key" TEXT PRIMARY KEY, "svg" TEXT, "rendered_at" FLOAT)')
+
+def _create_views_index(db: Database):
+    "The index on the `rendered_at` of the `rendered_views`, for `views_version`."
+    db.execute("CREATE INDEX IF NOT EXISTS idx_rendered_views_rendered_at ON rendered_views (rendered_at)")
+
+def _drop_toolflow_table(db: Database):
+    "Drop the `item_tool_phase` table: the `ToolflowIndex` of the `Repository` finds the items of a tool in memory."
+    db.execute('DROP TABLE IF EXISTS "item_tool_phase"')
+
+def _add_views_revision(db: Database):
+    "The `db_revision` of the `rendered_views`, so a worker doesn't replace a view with one rendered from older data."
+    db.execute('ALTER TABLE "rendered_views" ADD COLUMN "db_revision" INTEGER NOT NULL DEFAULT 0')
+
+MIGRATIONS: list[Callable[[Database], None]] = [ # Never change or remove a step, only add new ones at the end
+    _create_model_tables,
+    _create_toolflow_table,
+    _backfill_phase_codes,
+    _create_search_index,
+    _create_revisions_table,
+    _create_views_table,
+    _create_views_index,
+    _drop_toolflow_table,
+    _add_views_revision,
+]
+
+def schema_version(db: Database) -> int:
+    """Number of migrations that ran on `db`, 0 for a new database or one from before the schema had versions."""
+    if not db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_migrations'").fetchone(): return 0
+    return db.execute("SELECT max(version) FROM schema_migrations").fetchone()[0] or 0
+
+def migrate(
+    db: Database,
+    migrations: list[Callable[[Database], None]] | None = None # Ordered steps, `MIGRATIONS` by default
+) -> int:
+    """Run the `migrations` after the version of the schema of `db` and return the new version."""
+    migrations = MIGRATIONS if migrations is None else migrations
+    # The header of the database file has a copy of the version, which is cheaper to read than the table and exists in a new database
+    if (version := db.execute("PRAGMA user_version").fetchone()[0]) >= len(migrations): return version
+    with write_transaction(db):
+        db.execute("CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at REAL NOT NULL)")
+        # Another process may have migrated while this one waited for the write lock
+        version = schema_version(db)
+        for v,step in enumerate(migrations[version:], version+1):
+            step(db)
+            db.execute("INSERT INTO schema_migrations VALUES (?, ?, ?)", [v, step.__name__, time.time()])
+        version = max(version, len(migrations))
+        db.execute(f"PRAGMA user_version = {version}")
+    return version
@@ -0,0 +1,96 @@
+"""This module loads the packed quality per phase of all tools, or the packed method per phase of all information items, into NumPy arrays and queries them without a Python loop over the models."""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/08_phasetable.ipynb.
+
+# %% ../nbs/08_phasetable.ipynb #c96c02b4
+from __future__ import annotations
+from collections.abc import Mapping
+import numpy as np
+from fastcore.basics import patch
+from fastlite import Database
+from .classdb import *
+from .classdb import _packed_columns
+
+# %% auto #0
+__all__ = ['PhaseTable']
+
+# %% ../nbs/08_phasetable.ipynb #29717cf5
+class PhaseTable:
+    """The packed per-phase values of all rows of `table` ('tools' or 'information_items') in NumPy arrays."""
+    def __init__(self, table: str, slugs=(), codes=()):
+        if table not in _packed_columns: raise ValueError(f"Unknown table '{table}', use 'tools' or 'information_items'")
+        self.table = table
+        self.field,self.data_cls,_,self.column = _packed_columns[table]
+        self._slugs = np.array(list(slugs), dtype=object)
+        self._codes = np.array(list(codes), dtype=np.uint16)
+        self._n = len(self._slugs)
+        self._idx = {s: i for i,s in enumerate(self._slugs)}
+
+    @classmethod
+    def from_db(cls, db: Database, table: str) -> PhaseTable:
+        """Load the slugs and packed codes of `table`, ordered by id."""
+        if table not in _packed_columns: raise ValueError(f"Unknown table '{table}', use 'tools' or 'information_items'")
+        rows = db.execute(f'SELECT slug, "{_packed_columns[table][3]}" FROM "{table}" ORDER BY id').fetchall()
+        return cls(table, (r[0] for r in rows), (r[1] for r in rows))
+
+    @classmethod
+    def from_models(cls, models, table: str) -> PhaseTable:
+        """Table of the packed codes of `models`, a dict or list of models or `LazyModel`s."""
+        models = list(models.values() if isinstance(models, Mapping) else models)
+        field = _packed_columns[table][0]
+        return cls(table, (m.slug for m in models), (getattr(m, field).packed for m in models))
+
+    @property
+    def slugs(self) -> np.ndarray: return self._slugs[:self._n]
+    @property
+    def codes(self) -> np.ndarray: return self._codes[:self._n]
+    def __len__(self): return self._n
+    def __repr__(self): return f"{type(self).__name__}({self.table!r}, {self._n} rows)"
+
+    def set(self, model, replaces: str | None = None):
+        """Add or update the code of `model`, taking over the row of the slug `replaces` if it was renamed."""
+        i = self._idx.pop(replaces, None) if replaces is not None and replaces != model.slug else None
+        if i is None: i = self._idx.get(model.slug)
+        if i is None:
+            if self._n == len(self._codes):
+                cap = max(8, 2*self._n)
+                self._slugs = np.resize(self._slugs, cap)
+                self._codes = np.resize(self._codes, cap)
+            i,self._n = self._n,self._n+1
+        self._slugs[i],self._codes[i] = model.slug,getattr(model, self.field).packed
+        self._idx[model.slug] = i
+
+# %% ../nbs/08_phasetable.ipynb #7fa4c448
+def _shift(phase: str | Phase) -> int:
+    return PHASE_BITS * list(Phase).index(Phase(phase))
+
+@patch
+def values(self: PhaseTable, phase: str | Phase) -> np.ndarray:
+    """The code of `phase` for every row."""
+    return (self.codes >> _shift(phase)) & PHASE_MASK
+
+@patch
+def equals(self: PhaseTable, **phases) -> np.ndarray:
+    """Mask of the rows that have the given value for every phase in `phases`."""
+    mask = want = 0
+    for p,v in phases.items():
+        mask |= PHASE_MASK << _shift(p)
+        want |= self.data_cls.code(v) << _shift(p)
+    return (self.codes & mask) == want
+
+@patch
+def at_least(self: PhaseTable, **phases) -> np.ndarray:
+    """Mask of the rows that have at least the given value for every phase in `phases`."""
+    res = np.ones(len(self), dtype=bool)
+    for p,v in phases.items(): res &= self.values(p) >= self.data_cls.code(v)
+    return res
+
+@patch
+def select(self: PhaseTable, mask: np.ndarray) -> list[str]:
+    """Slugs of the rows where `mask` is true."""
+    return self.slugs[mask].tolist()
+
+@patch
+def counts(self: PhaseTable, phase: str | Phase) -> dict:
+    """Number of rows for every value of `phase`."""
+    return dict(zip(self.data_cls._codes, np.bincount(self.values(phase), minlength=len(self.data_cls._codes)).tolist()))
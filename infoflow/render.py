@@ -0,0 +1,170 @@
+"""This module renders the workflow visualisation to an interactive `SVG` string and caches the result."""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/04_render.ipynb.
+
+# %% auto #0
+__all__ = ['viz_key', 'RenderCache', 'RenderCoordinator', 'DotWorker', 'DotPool', 'PooledGraph']
+
+# %% ../nbs/04_render.ipynb #2d65b268
+import json, hashlib, threading, queue, subprocess
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import Future
+from dataclasses import asdict, is_dataclass
+
+# %% ../nbs/04_render.ipynb #866835a1
+def _flat(o) -> dict:
+    if hasattr(o, 'flatten_for_db'): return o.flatten_for_db()
+    return asdict(o) if is_dataclass(o) else dict(o)
+
+def _flats(os) -> list[dict]:
+    if os is None: return []
+    if isinstance(os, Mapping): os = os.values()
+    elif hasattr(os, 'flatten_for_db') or is_dataclass(os): os = [os]
+    return sorted((_flat(o) for o in os), key=lambda o: o.get('slug') or '')
+
+def viz_key(
+    items, # `InformationItem` instance(s) or rows from the `information_items` table
+    tools, # `Tool` instance(s) or rows from the `tools` table
+    tool_filter: str | None = None # Slug of the tool used to filter the graph
+) -> str:
+    """Stable content hash of the `items`, `tools` and `tool_filter` that define a workflow graph, independent of their order."""
+    payload = json.dumps([_flats(items), _flats(tools), tool_filter], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+# %% ../nbs/04_render.ipynb #2ea9a2dc
+class RenderCache:
+    """Thread-safe LRU cache for rendered SVG strings, bounded by `maxsize` entries and `maxbytes` characters."""
+    def __init__(self,
+                 maxsize: int = 128, # Maximum number of cached SVG strings
+                 maxbytes: int = 64*2**20): # Maximum total length of the cached SVG strings
+        self.maxsize,self.maxbytes = maxsize,maxbytes
+        self._d,self._lock = OrderedDict(),threading.Lock()
+        self.nbytes = self.hits = self.misses = 0
+
+    def __len__(self): return len(self._d)
+    def __contains__(self, key): return key in self._d
+
+    def get(self, key: str) -> str | None:
+        """Return the SVG cached under `key` and mark it as recently used, or `None`."""
+        with self._lock:
+            if key not in self._d: self.misses += 1; return None
+            self.hits += 1
+            self._d.move_to_end(key)
+            return self._d[key]
+
+    def set(self, key: str, svg: str) -> str:
+        """Cache `svg` under `key`, evicting the least recently used entries to stay within the limits."""
+        with self._lock:
+            if key in self._d: self.nbytes -= len(self._d.pop(key))
+            if len(svg) > self.maxbytes: return svg
+            self._d[key] = svg
+            self.nbytes += len(svg)
+            while len(self._d) > self.maxsize or self.nbytes > self.maxbytes: self.nbytes -= len(self._d.popitem(last=False)[1])
+        return svg
+
+    def get_or_render(self, key: str, render) -> str:
+        """Return the SVG cached under `key`, or call `render` and cache its result."""
+        svg = self.get(key)
+        return svg if svg is not None else self.set(key, render())
+
+    def clear(self):
+        """Drop all cached SVG strings."""
+        with self._lock: self._d.clear(); self.nbytes = 0
+
+# %% ../nbs/04_render.ipynb #04c1e622
+class RenderCoordinator:
+    """Share one in-flight render per key between concurrent callers and run at most `max_renders` renders at once."""
+    def __init__(self,
+                 max_renders: int = 2, # Maximum number of renders (`dot` processes) running in parallel
+                 cache: RenderCache | None = None): # Optional cache for the rendered SVG strings
+        self.max_renders,self.cache = max_renders,cache
+        self._sem,self._lock,self._inflight = threading.BoundedSemaphore(max_renders),threading.Lock(),{}
+
+    def render(self, key: str, render) -> str:
+        """Return the SVG for `key`, calling `render` only if it is neither cached nor being rendered already."""
+        if self.cache is not None and (svg := self.cache.get(key)) is not None: return svg
+        with self._lock:
+            if self.cache is not None and (svg := self.cache.get(key)) is not None: return svg
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner: fut = self._inflight[key] = Future()
+        if not owner: return fut.result()
+        try:
+            with self._sem: svg = render()
+            if self.cache is not None: self.cache.set(key, svg)
+            fut.set_result(svg)
+            return svg
+        except Exception as e: fut.set_exception(e); raise
+        finally:
+            with self._lock: self._inflight.pop(key, None)
+
+# %% ../nbs/04_render.ipynb #12ebb665
+class DotWorker:
+    """A long-lived `dot -Tsvg` process that renders one DOT source after the other."""
+    def __init__(self, cmd: tuple[str, ...] = ('dot', '-Tsvg')): # Command that starts the process
+        self.cmd,self.renders = cmd,0
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding='utf-8', bufsize=1)
+
+    def render(self, source: str, timeout: float = 30) -> str:
+        """Render the DOT `source` to an SVG string, killing the process if it takes more than `timeout` seconds."""
+        timer = threading.Timer(timeout, self.proc.kill)
+        timer.start()
+        try:
+            self.proc.stdin.write(source + '\n'); self.proc.stdin.flush()
+            lines = []
+            while line := self.proc.stdout.readline():
+                lines.append(line)
+                if line.startswith('</svg>'): break
+            else: raise RuntimeError(f"dot stopped before finishing the SVG (exit code {self.proc.poll()})")
+        finally: timer.cancel()
+        self.renders += 1
+        return ''.join(lines)
+
+    def close(self):
+        """Stop the `dot` process."""
+        if self.proc.poll() is None: self.proc.kill()
+        self.proc.wait()
+
+# %% ../nbs/04_render.ipynb #de9b7230
+class DotPool:
+    """Pool of `size` persistent `dot` workers, each replaced by a fresh worker after `max_renders` renders."""
+    def __init__(self,
+                 size: int = 2, # Number of `dot` processes
+                 max_renders: int = 200, # Number of renders after which a worker is replaced
+                 timeout: float = 30, # Maximum number of seconds for a single render
+                 cmd: tuple[str, ...] = ('dot', '-Tsvg')): # Command that starts a worker process
+        self.size,self.max_renders,self.timeout,self.cmd = size,max_renders,timeout,cmd
+        self._q,self._lock,self.started = queue.Queue(),threading.Lock(),False
+
+    def start(self):
+        """Start the worker processes, if that didn't happen already."""
+        with self._lock:
+            if not self.started:
+                for _ in range(self.size): self._q.put(DotWorker(self.cmd))
+                self.started = True
+        return self
+
+    def render(self, source: str) -> str:
+        """Render the DOT `source` to an SVG string with the first free worker."""
+        self.start()
+        w = self._q.get()
+        try: return w.render(source, self.timeout)
+        except Exception: w.renders = self.max_renders; raise
+        finally:
+            if w.renders >= self.max_renders: w.close(); w = DotWorker(self.cmd)
+            self._q.put(w)
+
+    def close(self):
+        """Stop all worker processes."""
+        with self._lock:
+            while not self._q.empty(): self._q.get().close()
+            self.started = False
+
+# %% ../nbs/04_render.ipynb #8f50f313
+class PooledGraph:
+    """A `graphviz` `graph` that is rendered by the persistent workers of a `DotPool`."""
+    def __init__(self, graph, pool: DotPool): self.graph,self.pool = graph,pool
+    def __getattr__(self, k): return getattr(self.graph, k)
+    def _repr_image_svg_xml(self) -> str: return self.pool.render(self.graph.source)
+    def _repr_svg_(self) -> str: return self._repr_image_svg_xml()
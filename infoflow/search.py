@@ -0,0 +1,79 @@
+"""This module keeps SQLite FTS5 full-text indexes of the tools, information items and improvements, and searches them all at once."""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/10_search.ipynb.
+
+# %% auto #0
+__all__ = ['HIT_START', 'HIT_END', 'create_search_index', 'SearchHit', 'fts_query', 'search']
+
+# %% ../nbs/10_search.ipynb #215111b9
+import re
+from dataclasses import dataclass
+from fastlite import Database
+
+# %% ../nbs/10_search.ipynb #9dd9d48f
+_search_tables = dict( # table -> (kind of the search hit, columns to index)
+    tools=('tool', ['name', 'description', 'collect', 'retrieve', 'consume', 'extract', 'refine']),
+    information_items=('item', ['name']),
+    improvements=('improvement', ['name', 'what', 'why', 'how']),
+)
+
+def _triggers(tbl: str, cols: list[str]) -> dict[str, str]:
+    fts,names = f"{tbl}_fts",', '.join(cols)
+    new,old = ', '.join(f'new."{c}"' for c in cols),', '.join(f'old."{c}"' for c in cols)
+    ins = f'INSERT INTO "{fts}"(rowid, {names}) VALUES (new.id, {new});'
+    dele = f'INSERT INTO "{fts}"("{fts}", rowid, {names}) VALUES (\'delete\', old.id, {old});'
+    return {f"{fts}_ai": f'AFTER INSERT ON "{tbl}" BEGIN {ins} END',
+            f"{fts}_ad": f'AFTER DELETE ON "{tbl}" BEGIN {dele} END',
+            f"{fts}_au": f'AFTER UPDATE ON "{tbl}" BEGIN {dele} {ins} END'}
+
+def create_search_index(db: Database):
+    """Create the FTS5 tables and their triggers for the tables in `db`, and fill the new ones."""
+    existing = {r[0] for r in db.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+    for tbl,(_,cols) in _search_tables.items():
+        if tbl not in existing: continue
+        fts,trigs = f"{tbl}_fts",_triggers(tbl, cols)
+        if fts in existing and all(t in existing for t in trigs): continue
+        with db.conn:
+            if fts not in existing:
+                db.execute(f"""CREATE VIRTUAL TABLE "{fts}" USING fts5({', '.join(cols)}, content='{tbl}', content_rowid='id', prefix='2 3')""")
+                weights = ', '.join('10.0' if c == 'name' else '1.0' for c in cols)
+                db.execute(f"""INSERT INTO "{fts}"("{fts}", rank) VALUES ('rank', 'bm25({weights})')""")
+            for name,sql in trigs.items(): db.execute(f'CREATE TRIGGER IF NOT EXISTS "{name}" {sql}')
+            db.execute(f"""INSERT INTO "{fts}"("{fts}") VALUES ('rebuild')""")
+
+# %% ../nbs/10_search.ipynb #6e6e76e0
+HIT_START,HIT_END = '\x02','\x03' # Marks around the matching words in `SearchHit.snippet`
+
+@dataclass
+class SearchHit:
+    kind: str # 'tool', 'item' or 'improvement'
+    slug: str
+    name: str
+    snippet: str # Matching text, with the matching words between `HIT_START` and `HIT_END`
+    rank: float # bm25 score, lower is better
+
+def fts_query(q: str) -> str | None:
+    """The FTS5 query that matches all words of `q`, the last one also as a prefix. None if `q` has no words."""
+    words = re.findall(r'\w+', q.lower())
+    if not words: return None
+    return ' '.join(f'"{w}"' for w in words) + '*'
+
+def search(
+        db: Database,
+        q: str, # The words to look for
+        limit: int = 20 # Maximum number of hits
+    ) -> list[SearchHit]:
+    """The best `limit` hits for `q` in the tools, information items and improvements, best first."""
+    match = fts_query(q)
+    if match is None: return []
+    existing = {r[0] for r in db.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    parts,args = [],[]
+    for tbl,(kind,cols) in _search_tables.items():
+        fts = f"{tbl}_fts"
+        if fts not in existing: continue
+        parts.append(f"""SELECT * FROM (SELECT '{kind}', t.slug, t.name, snippet("{fts}", -1, ?, ?, '…', 12), "{fts}".rank
+            FROM "{fts}" JOIN "{tbl}" t ON t.id = "{fts}".rowid WHERE "{fts}" MATCH ? ORDER BY "{fts}".rank LIMIT ?)""")
+        args += [HIT_START, HIT_END, match, limit]
+    if not parts: return []
+    sql = ' UNION ALL '.join(parts) + ' ORDER BY 5 LIMIT ?'
+    return [SearchHit(*r) for r in db.execute(sql, args + [limit])]
@@ -0,0 +1,63 @@
+"""This module measures how long it takes to import the modules of `infoflow`, and checks that every import stays within its budget."""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/12_startup.ipynb.
+
+# %% auto #0
+__all__ = ['IMPORT_BUDGETS', 'import_time', 'check_import_budgets', 'infoflow_import_budget']
+
+# %% ../nbs/12_startup.ipynb #e5375a23
+import json, subprocess, sys
+from fastcore.script import call_parse
+
+# %% ../nbs/12_startup.ipynb #0dfa0a92
+_probe = """import sys, time, json
+before = set(sys.modules)
+t = time.perf_counter()
+import {module}
+t = time.perf_counter() - t
+print(json.dumps([t, sorted({{m.split('.')[0] for m in set(sys.modules) - before}})]))"""
+
+def import_time(
+    module: str, # Dotted name of the module, like 'infoflow.viz'
+    runs: int = 3 # Number of imports, each in a new process
+) -> tuple[float, set[str]]:
+    """Fastest time in seconds to import `module` in a new Python process, and the top-level packages it loads."""
+    res = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', _probe.format(module=module)], capture_output=True, text=True, check=True).stdout
+        res.append(json.loads(out.splitlines()[-1]))
+    t,pkgs = min(res, key=lambda r: r[0])
+    return t, set(pkgs)
+
+# %% ../nbs/12_startup.ipynb #17bb0c30
+IMPORT_BUDGETS = { # Seconds, about 2.5 times the import time on a development laptop
+    'infoflow.classdb': 1.0, 'infoflow.viz': 1.0, 'infoflow.webapp': 1.0, 'infoflow.views': 1.0,
+    'infoflow.importer': 1.0, 'infoflow.exporter': 1.0, 'infoflow.search': 1.0, 'infoflow.coverage': 1.0,
+    'infoflow.migrations': 1.0}
+_ui_packages = {'fasthtml', 'monsterui'} # Only `main.py` needs these
+
+def check_import_budgets(
+    budgets: dict[str, float] | None = None, # Seconds per module, `IMPORT_BUDGETS` by default
+    runs: int = 3, # Imports per module, the fastest counts
+    scale: float = 1.0 # Factor for all budgets
+) -> dict[str, float]:
+    """Import time of every module in `budgets`. Fails when one is over its budget or loads a web framework."""
+    times,errors = {},[]
+    for module,budget in (budgets or IMPORT_BUDGETS).items():
+        t,pkgs = import_time(module, runs)
+        times[module] = t
+        if t > budget*scale: errors.append(f"{module}: {t:.2f}s > {budget*scale:.2f}s")
+        if pkgs & _ui_packages: errors.append(f"{module} imports {', '.join(sorted(pkgs & _ui_packages))}")
+    if errors: raise AssertionError("Import budget exceeded:\n" + '\n'.join(errors))
+    return times
+
+# %% ../nbs/12_startup.ipynb #b8295ba1
+@call_parse
+def infoflow_import_budget(
+    runs: int = 3, # Imports per module, the fastest counts
+    scale: float = 1.0 # Factor for all budgets
+):
+    "Check the import time of the modules of `infoflow` against `IMPORT_BUDGETS`."
+    try: times = check_import_budgets(runs=runs, scale=scale)
+    except AssertionError as e: sys.exit(str(e))
+    for module,t in times.items(): print(f"{module:<20} {t:.3f}s (budget {IMPORT_BUDGETS[module]*scale:.1f}s)")
@@ -0,0 +1,196 @@
+"""This module keeps the rendered `SVG` of every view of the workflow graph in the database, and re-renders the views a change affects in a background thread."""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/11_views.ipynb.
+
+# %% ../nbs/11_views.ipynb #f901f463
+from __future__ import annotations
+import itertools, threading, time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from fastlite import Database, Table
+from .classdb import *
+from .classdb import _toolflow_slugs
+
+# %% auto #0
+__all__ = ['RenderedView', 'create_views_table', 'create_views_index', 'views_version', 'view_key', 'view_keys', 'ViewStore',
+           'ViewIndex']
+
+# %% ../nbs/11_views.ipynb #d2279616
+@dataclass
+class RenderedView:
+    key: str # 'all', 'tool:<slug>' or 'item:<slug>', see `view_key`
+    svg: str
+    rendered_at: float # `time.time()` of the render
+    db_revision: int = 0 # `db_revision` of the data the view was rendered from
+
+def create_views_table(db: Database) -> Table:
+    """Create the `rendered_views` table, if it doesn't exist."""
+    return db.create(RenderedView, name='rendered_views', pk='key')
+
+def create_views_index(db: Database):
+    """Index the `rendered_at` of the `rendered_views`, so `views_version` doesn't read the stored SVG."""
+    db.execute("CREATE INDEX IF NOT EXISTS idx_rendered_views_rendered_at ON rendered_views (rendered_at)")
+
+def views_version(db: Database) -> float:
+    """The `rendered_at` of the last view stored in `db` by any connection, or 0."""
+    return db.execute("SELECT max(rendered_at) FROM rendered_views").fetchone()[0] or 0
+
+def view_key(tool: str | None = None, item: str | None = None) -> str:
+    """Key of the view of the graph filtered on `tool`, of the graph of `item`, or of the whole graph."""
+    return f"tool:{tool}" if tool else f"item:{item}" if item else 'all'
+
+def view_keys(index: ToolflowIndex) -> list[str]:
+    """Keys of all views of the tools and items in `index`: the whole graph first, then the tools, then the items."""
+    return ['all', *(view_key(tool=t) for t in index.tools), *(view_key(item=s) for s in index.items)]
+
+# %% ../nbs/11_views.ipynb #059689d3
+class ViewStore:
+    """The rendered SVG of every view in the `rendered_views` table of `db`, with a background thread that re-renders the stale views."""
+    def __init__(self,
+                 db: Database,
+                 render: Callable[[str], str], # Renders the view with a key from `view_key` to SVG
+                 sync: Callable[[], int] | None = None, # Brings the data of `render` up to date and returns its `db_revision`
+                 busy_timeout: int = 5000): # Milliseconds to wait for a write lock on the database
+        # A connection of its own, because the background thread can't use `db` while another thread does
+        self._own_conn = bool(db.conn.filename)
+        self.db,self.render_view,self.sync = Database(db.conn.filename) if self._own_conn else db,render,sync
+        self.db.conn.setbusytimeout(busy_timeout)
+        self.table = self.db.t.rendered_views # Created by `migrate`
+        self._pending,self._inflight,self._cond,self._db_lock = OrderedDict(),{},threading.Condition(),threading.Lock()
+        self._thread,self._stop,self.revision,self.errors = None,False,0,{}
+
+    def keys(self) -> set[str]:
+        """Keys of the stored views."""
+        with self._db_lock: return {r[0] for r in self.db.execute("SELECT key FROM rendered_views")}
+
+    def stored(self, key: str) -> str | None:
+        """The stored SVG of the view `key`, stale or not."""
+        with self._db_lock: rows = self.db.execute("SELECT svg FROM rendered_views WHERE key = ?", [key]).fetchall()
+        return rows[0][0] if rows else None
+
+    @property
+    def pending(self) -> list[str]:
+        """Keys of the stale views, in the order they'll be rendered."""
+        with self._cond: return list(self._pending)
+
+    def refresh(self, keys: Iterable[str], urgent: bool = False):
+        """Mark the views `keys` as stale, to be re-rendered after the other stale views, or before them when `urgent`."""
+        keys = list(keys)
+        with self._cond:
+            for k in (reversed(keys) if urgent else keys):
+                self._pending[k] = None
+                if urgent: self._pending.move_to_end(k, last=False)
+            self._cond.notify_all()
+
+    def drop(self, *keys: str):
+        """Remove the views `keys`, e.g. of a renamed tool or item."""
+        with self._cond:
+            for k in keys: self._pending.pop(k, None)
+        with self._db_lock:
+            for k in keys: self.table.delete_where('key = ?', [k])
+
+    def clear(self):
+        """Remove all stored views, e.g. after a bulk import."""
+        with self._cond: self._pending.clear()
+        with self._db_lock: self.table.delete_where()
+
+    def _render(self, key: str) -> str:
+        with self._cond:
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner: self._pending.pop(key, None); fut = self._inflight[key] = Future()
+        if not owner: return fut.result()
+        try:
+            # Other processes store views too, so a view only replaces one rendered from the same or older data
+            rev = self.sync() if self.sync else 0
+            svg = self.render_view(key)
+            with self._db_lock:
+                stored = self.db.execute("""INSERT INTO rendered_views (key, svg, rendered_at, db_revision) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (key) DO UPDATE SET svg = excluded.svg, rendered_at = excluded.rendered_at, db_revision = excluded.db_revision
+                    WHERE excluded.db_revision >= rendered_views.db_revision RETURNING 1""", [key, svg, time.time(), rev]).fetchall()
+                if not stored: svg = self.db.execute("SELECT svg FROM rendered_views WHERE key = ?", [key]).fetchone()[0]
+            with self._cond: self.revision += bool(stored); self.errors.pop(key, None)
+            fut.set_result(svg)
+            return svg
+        except Exception as e: self.errors[key] = e; fut.set_exception(e); raise
+        finally:
+            with self._cond: self._inflight.pop(key, None); self._cond.notify_all()
+
+    def get(self, key: str) -> str:
+        """The SVG of the view `key`: the stored one if it's current, otherwise rendered now."""
+        with self._cond: stale = key in self._pending or key in self._inflight or key in self.errors
+        if not stale and (svg := self.stored(key)) is not None: return svg
+        return self._render(key)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stop: self._cond.wait()
+                if self._stop: return
+                key = next(iter(self._pending))
+            try: self._render(key)
+            except Exception: pass # Kept in `errors`, and `get` renders the view again
+
+    def start(self):
+        """Start the background thread, if it isn't running."""
+        with self._cond:
+            if self._thread is None:
+                self._stop,self._thread = False,threading.Thread(target=self._run, name='view-renderer', daemon=True)
+                self._thread.start()
+        return self
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until no views are stale or being rendered, for at most `timeout` seconds. Returns whether that happened."""
+        with self._cond: return self._cond.wait_for(lambda: not self._pending and not self._inflight, timeout)
+
+    def close(self):
+        """Stop the background thread after its current render, and close the connection the store opened."""
+        with self._cond: self._stop = True; self._cond.notify_all(); t,self._thread = self._thread,None
+        if t is not None: t.join()
+        # The last connection to close checkpoints the WAL, which would otherwise outlive the process
+        if self._own_conn:
+            with self._db_lock: self.db.conn.close()
+
+# %% ../nbs/11_views.ipynb #a37ff65b
+_versions = itertools.count(1)
+
+class ViewIndex:
+    """Index of a `Repository` that refreshes the views in `store` that every saved tool or item affects."""
+    def __init__(self,
+                 items: dict[str, InformationItem] | list[InformationItem] | None = None,
+                 tools: dict[str, Tool] | list[Tool] | None = None,
+                 store: ViewStore | None = None): # The stored views to refresh
+        self.store,self.toolflow,self.versions,self.loaded = store,ToolflowIndex(items, tools),{},next(_versions)
+        keys,stored = view_keys(self.toolflow),store.keys()
+        store.drop(*(stored - set(keys)))
+        store.refresh(k for k in keys if not k.startswith('item:') or k not in stored)
+
+    def version(self, key: str) -> int:
+        """Number that changes whenever a save changes the view `key`."""
+        return self.versions.get(key, self.loaded)
+
+    def _changed(self, keys: list[str]):
+        v = next(_versions)
+        for k in keys: self.versions[k] = v
+        self.store.refresh(keys, urgent=True)
+
+    def _tool_views(self, items) -> list[str]:
+        tools = {t for i in items for ts in _toolflow_slugs(i).values() for t in ts}
+        return [view_key(tool=t) for t in self.toolflow.tools if t in tools]
+
+    def add_tool(self, tool: Tool, replaces: str | None = None):
+        """Add or update `tool`, and refresh the views it is in."""
+        items = {k: v for s in {tool.slug, replaces} - {None} for k,v in self.toolflow.items_for_tool(s).items()}
+        self.toolflow.add_tool(tool, replaces)
+        if replaces and replaces != tool.slug: self.store.drop(view_key(tool=replaces))
+        keys = ['all', view_key(tool=tool.slug), *self._tool_views(items.values()), *(view_key(item=s) for s in items)]
+        self._changed(list(dict.fromkeys(keys)))
+
+    def add_item(self, item: InformationItem, replaces: str | None = None):
+        """Add or update `item`, and refresh the views it is in."""
+        old = self.toolflow.items.get(replaces or item.slug)
+        self.toolflow.add_item(item, replaces)
+        if replaces and replaces != item.slug: self.store.drop(view_key(item=replaces))
+        self._changed(['all', view_key(item=item.slug), *self._tool_views([i for i in (old, item) if i is not None])])
@@ -3,19 +3,24 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/02_create_vizualisation.ipynb.
 
 # %% auto #0
-__all__ = ['get_info_items_for_tool', 'build_graphiz_from_intances', 'create_workflow_viz']
+__all__ = ['group_keys', 'get_info_items_for_tool', 'workflow_ranks', 'toolflow_signature', 'group_items', 'group_members',
+           'grouped_ranks', 'build_graphiz_from_intances', 'create_workflow_viz']
 
 # %% ../nbs/02_create_vizualisation.ipynb #6d239afd
 import graphviz
-from fastcore.test import *
-import operator # also gets imported with fasthtml.common
+import operator
+from collections import Counter
+from collections.abc import Mapping
+from urllib.parse import urlencode, quote_plus
 from .classdb import *
-from .creinst import *
+from .layout import *
+from .render import *
 
 # %% ../nbs/02_create_vizualisation.ipynb #bca71c25
 def get_info_items_for_tool(tool_name: str, info_items: dict[InformationItem]) -> dict[InformationItem]:
     """Filters all the instances of the class InformationItem based on which information items can be processed by the given tool."""
-    if isinstance(info_items, dict): info_items = info_items.values()
+    if isinstance(info_items, ToolflowIndex): return {i.name: i for i in info_items.items_for_tool(tool_name).values()}
+    if isinstance(info_items, Mapping): info_items = info_items.values()
     phases = ['collect', 'retrieve', 'consume', 'extract', 'refine']
     tool_name = tool_name.lower()
     
@@ -33,86 +38,163 @@ def get_info_items_for_tool(tool_name: str, info_items: dict[InformationItem]) -
     
     return res
 
-# %% ../nbs/02_create_vizualisation.ipynb #3e096b73
-# New function based on updated dataclasses
-def build_graphiz_from_intances(info_items, tools) -> graphviz.graphs.Digraph:
-    """Create a graphviz visualisation using the updated dataclasses for InformationItem and Tool.
-    Produces the same layout as build_graphiz_from_instances.
-    """
-    if isinstance(info_items, dict): info_items = list(info_items.values())
+# %% ../nbs/02_create_vizualisation.ipynb #5c23c876
+_phases = ['collect', 'retrieve', 'consume', 'extract', 'refine']
+_quality_colors = {PhaseQuality.GREAT: 'lightgreen', PhaseQuality.OK: 'lightblue', PhaseQuality.BAD: 'orange', PhaseQuality.NA: 'lightgray'}
+
+def _items_and_tools(info_items, tools) -> tuple[list, dict]:
+    if isinstance(info_items, ToolflowIndex): tools,info_items = info_items.tools if tools is None else tools,list(info_items.items.values())
+    if isinstance(info_items, Mapping): info_items = list(info_items.values())
     elif not isinstance(info_items, list): info_items = [info_items]
-    if isinstance(tools, dict): tools = list(tools.values())
+    if isinstance(tools, Mapping): tools = list(tools.values())
+    return info_items, {getattr(t, 'slug', None): t for t in tools or []}
+
+def _tool_ranks(info_items, tools: dict) -> list[list[dict]]:
+    "One rank of tool nodes per phase, for the tools the `info_items` use in that phase."
+    all_nodes,phase_ranks = set(),[]
+    for phase in _phases:
+        rank = []
+        for info_item in info_items:
+            tool_entry = getattr(getattr(info_item, 'toolflow', None), phase, None)
+            if tool_entry is None: continue
+            tools_in_phase = tool_entry if isinstance(tool_entry, (tuple)) else (tool_entry,)
+            for tool_slug in tools_in_phase:
+                if tool_slug is None: continue
+                node_id = f"{tool_slug}_{phase}"
+                if node_id in all_nodes: continue
+                tool = tools.get(tool_slug)
+                q = getattr(getattr(tool, 'phase_quality', None), phase, PhaseQuality.NA) if tool else PhaseQuality.NA
+                color = _quality_colors.get(q, 'white')
+                rank.append(dict(id=node_id, label=f"{tool_slug}\n({phase})", shape='hexagon', fillcolor=color, url=f"/tool?slug={tool_slug}", cls='tool'))
+                all_nodes.add(node_id)
+        phase_ranks.append(rank)
+    return phase_ranks
+
+def _flow_edges(info_item, source_id: str) -> list[tuple[str, str]]:
+    "The edges from `source_id` along the tools of `info_item`, phase after phase."
+    prev_nodes,edges = [source_id],{}
+    for phase in _phases:
+        tool_entry = getattr(getattr(info_item, 'toolflow', None), phase, None)
+        if tool_entry is None: continue
+        curr_nodes = []
+        tools_in_phase = tool_entry if isinstance(tool_entry, (list, tuple)) else (tool_entry,)
+        for tool_name in tools_in_phase:
+            if tool_name is None: continue
+            node_id = f"{str(tool_name).lower()}_{phase}"
+            curr_nodes.append(node_id)
+            for prev in prev_nodes: edges[(prev, node_id)] = True
+        if curr_nodes: prev_nodes = curr_nodes
+    return list(edges)
+
+def workflow_ranks(info_items, tools) -> tuple[list[list[dict]], list[tuple[str, str]]]:
+    """Nodes per rank (the sources followed by one rank per phase) and the edges of the workflow graph for `info_items`, coloured by `tools`."""
+    info_items,tools = _items_and_tools(info_items, tools)
+    # Create source nodes for each InformationItem type (label with item.name, id by info_type)
+    sources = [dict(id=f"source_{s.slug}", label=s.name, shape='box', fillcolor='white', url=f"/resource?slug={s.slug}", cls='resource') for s in info_items]
+    # Connect edges along the flow
+    edges = {e: True for s in info_items for e in _flow_edges(s, f"source_{getattr(s, 'slug', None)}")}
+    return [sources] + _tool_ranks(info_items, tools), list(edges)
+
+# %% ../nbs/02_create_vizualisation.ipynb #604dbc1f
+def toolflow_signature(info_item) -> str:
+    "The tools of `info_item` per phase, as a string that is the same for items that take the same path through the workflow graph."
+    tf = getattr(info_item, 'toolflow', None)
+    def _tools(v): return () if v is None else v if isinstance(v, (list, tuple)) else (v,)
+    return '|'.join(','.join(t for t in _tools(getattr(tf, p, None)) if t) for p in _phases)
+
+group_keys = dict(type=lambda i: i.info_type.value, toolflow=toolflow_signature)
+
+def _group_label(by: str, key: str) -> str:
+    if by == 'type': return key.replace('_', ' ').title()
+    return ' → '.join(p for p in key.split('|') if p) or 'No tools'
+
+def group_items(info_items, # `InformationItem`s as a list, dict or `ToolflowIndex`
+                by: str = 'type' # 'type' to group on `InformationType`, 'toolflow' on `toolflow_signature`
+               ) -> dict[str, list[InformationItem]]:
+    """The `info_items` per group key, in the order the groups first occur."""
+    if by not in group_keys: raise ValueError(f"Unknown grouping '{by}', use one of {list(group_keys)}")
+    res = {}
+    for i in _items_and_tools(info_items, None)[0]: res.setdefault(group_keys[by](i), []).append(i)
+    return res
+
+def group_members(info_items, # `InformationItem`s as a list, dict or `ToolflowIndex`
+                  by: str, # The grouping of the group, 'type' or 'toolflow'
+                  key: str, # The group key
+                  **parents # The groups that were expanded to get to this one, as grouping=key, e.g. `type='book'`
+                 ) -> list[InformationItem]:
+    """The `info_items` in group `key` of grouping `by` that are in all the `parents` groups as well."""
+    keys = {**parents, by: key}
+    for b in keys:
+        if b not in group_keys: raise ValueError(f"Unknown grouping '{b}', use one of {list(group_keys)}")
+    return [i for i in _items_and_tools(info_items, None)[0] if all(group_keys[b](i) == k for b,k in keys.items())]
 
+# %% ../nbs/02_create_vizualisation.ipynb #aaab8263
+def grouped_ranks(info_items, tools,
+                  by: str = 'type', # 'type' to group on `InformationType`, 'toolflow' on `toolflow_signature`
+                  url: str = '/graph_group', # Link of a group node, with `by`, `key` and `params` in the query string
+                  **params
+                 ) -> tuple[list[list[dict]], list[tuple[str, str]], dict[tuple[str, str], int]]:
+    """Like `workflow_ranks`, but with one source node per group of `info_items`, plus the number of items along every edge."""
+    if by not in group_keys: raise ValueError(f"Unknown grouping '{by}', use one of {list(group_keys)}")
+    info_items,tools = _items_and_tools(info_items, tools)
+    sizes,flows,reps = Counter(),Counter(),{}
+    for i in info_items:
+        tf = getattr(i, 'toolflow', None)
+        g,s = group_keys[by](i),tuple(getattr(tf, p, None) for p in _phases)
+        sizes[g] += 1; flows[g,s] += 1; reps.setdefault(s, i)
+    ids = {g: f"group_{n}" for n,g in enumerate(sizes)}
+    sources = [dict(id=ids[g], label=f"{_group_label(by, g)}\n({n} item{'s'*(n!=1)})", shape='box', fillcolor='white',
+                    url=f"{url}?{urlencode(dict(by=by, key=g, **params))}", cls='group') for g,n in sizes.items()]
+    counts = Counter()
+    for (g,s),n in flows.items():
+        for e in _flow_edges(reps[s], ids[g]): counts[e] += n
+    return [sources] + _tool_ranks(list(reps.values()), tools), list(counts), dict(counts)
+
+# %% ../nbs/02_create_vizualisation.ipynb #3e096b73
+def _digraph(ranks, edges, edge_labels=None) -> graphviz.graphs.Digraph:
+    (sources, *phase_ranks),edge_labels = ranks,edge_labels or {}
     dot = graphviz.Digraph(
         comment='PKM Workflow',
         graph_attr={'bgcolor': 'transparent', 'format':'svg'},
         edge_attr={'color': 'lightblue', 'fontcolor': 'lightblue'})
     dot.attr(rankdir='TB')
 
-    phases = ['collect', 'retrieve', 'consume', 'extract', 'refine']
-    all_nodes = set()
-    edges = {}
-
-    quality_colors = {PhaseQuality.GREAT: 'lightgreen', PhaseQuality.OK: 'lightblue', PhaseQuality.BAD: 'orange', PhaseQuality.NA: 'lightgray'}
-
-    # Create tool nodes per phase
-    for phase in phases:
+    for rank in phase_ranks + [sources]:
         with dot.subgraph() as s:
             s.attr(rank='same')
-            for info_item in info_items:
-                tool_entry = getattr(getattr(info_item, 'toolflow', None), phase, None)
-                if tool_entry is None: continue
-                tools_in_phase = tool_entry if isinstance(tool_entry, (tuple)) else (tool_entry,)
-                for tool_slug in tools_in_phase:
-                    if tool_slug is None: continue
-                    node_id = f"{tool_slug}_{phase}"
-                    if node_id in all_nodes: continue
-                    tool = next((t for t in tools if getattr(t, 'slug', None) == tool_slug), None)
-                    q = getattr(getattr(tool, 'phase_quality', None), phase, PhaseQuality.NA) if tool else PhaseQuality.NA
-                    color = quality_colors.get(q, 'white')
-                    s.node(node_id, f"{tool_slug}\n({phase})", shape='hexagon', fillcolor=color, style='filled')
-                    all_nodes.add(node_id)
-
-    # Create source nodes for each InformationItem type (label with item.name, id by info_type)
-    with dot.subgraph() as s:
-        s.attr(rank='same')
-        for source in info_items:
-            source_name = getattr(source, 'name', None)
-            source_slug = getattr(source, 'slug', None)
-            source_id = f"source_{source_slug}"
-            s.node(source_id, source_name, shape='box', fillcolor='white', style='filled')
-
-    # Connect edges along the flow
-    for source in info_items:
-        source_name = getattr(source, 'name', None)
-        source_slug = getattr(source, 'slug', None)
-        source_id = f"source_{source_slug}"
-        prev_nodes = [source_id]
-        for phase in phases:
-            tool_entry = getattr(getattr(source, 'toolflow', None), phase, None)
-            if tool_entry is None: continue
-            curr_nodes = []
-            tools_in_phase = tool_entry if isinstance(tool_entry, (list, tuple)) else (tool_entry,)
-            for tool_name in tools_in_phase:
-                if tool_name is None: continue
-                node_id = f"{str(tool_name).lower()}_{phase}"
-                curr_nodes.append(node_id)
-                for prev in prev_nodes:
-                    key = (prev, node_id)
-                    if key in edges: continue
-                    dot.edge(prev, node_id)
-                    edges[key] = True
-            if curr_nodes: prev_nodes = curr_nodes
-
+            for n in rank: s.node(n['id'], n['label'], shape=n['shape'], fillcolor=n['fillcolor'], style='filled', URL=n['url'], id=n['id'], _attributes={'class': n['cls']})
+    for e in edges:
+        if e in edge_labels: dot.edge(*e, label=str(edge_labels[e]))
+        else: dot.edge(*e)
     return dot
 
+# New function based on updated dataclasses
+def build_graphiz_from_intances(info_items, tools,
+                                group_by: str | None = None # Collapse the items into groups with `grouped_ranks`, 'type' or 'toolflow'
+                               ) -> graphviz.graphs.Digraph:
+    """Create a graphviz visualisation using the updated dataclasses for InformationItem and Tool.
+    Produces the same layout as build_graphiz_from_instances.
+    """
+    return _digraph(*grouped_ranks(info_items, tools, group_by)) if group_by else _digraph(*workflow_ranks(info_items, tools))
+
 # %% ../nbs/02_create_vizualisation.ipynb #2595da50
-def create_workflow_viz(items: InformationItem | dict[str, InformationItem],
-                        tools: Tool | dict[str, Tool],
-                        tool_filter: None | str = None) -> graphviz.graphs.Digraph:
+def create_workflow_viz(items: InformationItem | dict[str, InformationItem] | ToolflowIndex,
+                        tools: Tool | dict[str, Tool] | None = None, # Defaults to the tools of `items` when that is a `ToolflowIndex`
+                        tool_filter: None | str = None,
+                        backend: str = 'graphviz', # 'graphviz' to lay out with the `dot` binary, 'layered' for the in-process `LayeredGraph`
+                        pool: DotPool | None = None, # Persistent `dot` workers to render a 'graphviz' graph with
+                        group_by: str | None = None, # Collapse the items into one node per 'type' or 'toolflow', see `grouped_ranks`
+                        params: dict | None = None # More query parameters for the group links, like the parent group of `items`
+                       ) -> graphviz.graphs.Digraph | LayeredGraph | PooledGraph:
     """Create workflow visualization with flexible filtering options."""
+    if isinstance(items, ToolflowIndex) and tools is None: tools = items.tools
+    params = {**(params or {}), **(dict(tool=tool_filter) if tool_filter else {})} # Keeps the filter when a group is expanded
     # Filter by tool if specified
     if tool_filter:
         items = get_info_items_for_tool(tool_filter, items)
     
-    return build_graphiz_from_intances(items, tools)
+    graph = grouped_ranks(items, tools, group_by, **params) if group_by else workflow_ranks(items, tools)
+    if backend == 'layered': return LayeredGraph(*graph)
+    if backend != 'graphviz': raise ValueError(f"Unknown backend '{backend}', use 'graphviz' or 'layered'")
+    dot = _digraph(*graph)
+    return dot if pool is None else PooledGraph(dot, pool)
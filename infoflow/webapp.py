@@ -3,76 +3,90 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/03_create_webapp.ipynb.
 
 # %% auto #0
-__all__ = ['dict_svgnodes', 'add_onclick_to_nodes']
+__all__ = ['GraphLinkHandler', 'RegistryScope', 'ConditionalGet', 'DbExecutor']
 
 # %% ../nbs/03_create_webapp.ipynb #f4b2793e
-import re
-import xml.etree.ElementTree as ET
-from pprint import pprint
-from fastcore.test import *
-from fasthtml.common import *
-from monsterui.all import *
-
-from hopsa import ossys
+import asyncio
+import contextvars
+import hashlib
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from fastcore.xml import Script, NotStr
 
 from .classdb import *
-from .creinst import *
-from .viz import *
 
-# %% ../nbs/03_create_webapp.ipynb #d4bdd63e
-def dict_svgnodes(svg_str: str):
-   # Remove all xmlns declarations to get rid of namespace declaration when using .findall
-   cln_svg = re.sub(r'xmlns[^=]*="[^"]*"', '', svg_str)
-   root = ET.fromstring(cln_svg)
+# %% ../nbs/03_create_webapp.ipynb #42b92dd9
+def GraphLinkHandler(
+    graph_sel: str = '#infoflow-graph', # CSS selector of the element that contains the SVG graph
+    target: str = '#main-content', # CSS selector of the element the linked page is swapped into
+    swap: str = 'outerHTML' # htmx swap strategy
+):
+    """Script that turns a click on a link in the SVG graph inside `graph_sel` into an htmx request that swaps the linked page into `target`."""
+    return Script(NotStr(f"""document.addEventListener('click', e => {{
+    const a = e.target.closest('{graph_sel} a');
+    if (!a) return;
+    e.preventDefault();
+    htmx.ajax('GET', a.getAttribute('href') || a.getAttribute('xlink:href'), {{target: '{target}', swap: '{swap}'}});
+}});"""))
+
+# %% ../nbs/03_create_webapp.ipynb #db3bd86d
+class RegistryScope:
+    """ASGI middleware that handles every HTTP request in its own `registry_scope`."""
+    def __init__(self, app): self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http': return await self.app(scope, receive, send)
+        with registry_scope(): await self.app(scope, receive, send)
+
+# %% ../nbs/03_create_webapp.ipynb #d1f00d20
+class ConditionalGet:
+    """ASGI middleware that answers a `GET` request for one of `paths` with `304 Not Modified` when the tag in `If-None-Match` is still current, and otherwise adds the `ETag`."""
+    def __init__(self, app,
+                 etag: Callable[[], str], # Cheap version of the data the pages are built from, the same in every process, like `db_revision`
+                 paths: Iterable[str] | None = None): # Paths to handle, all when `None`
+        self.app,self.etag,self.paths = app,etag,None if paths is None else set(paths)
+
+    def tag(self, scope) -> str:
+        "Weak `ETag` of the response to the request in `scope`, for the current version of the data."
+        hx = dict(scope['headers']).get(b'hx-request', b'')
+        key = f"{self.etag()}|{scope['path']}?{scope['query_string'].decode()}|{hx.decode()}"
+        return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
 
-   nodes = {}
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'GET' or (self.paths is not None and scope['path'] not in self.paths):
+            return await self.app(scope, receive, send)
+        tag = self.tag(scope)
+        headers = [(b'etag', tag.encode()), (b'cache-control', b'no-cache'), (b'vary', b'HX-Request')]
+        if_none = dict(scope['headers']).get(b'if-none-match', b'').decode()
+        if tag in (t.strip() for t in if_none.split(',')):
+            await send(dict(type='http.response.start', status=304, headers=headers))
+            return await send(dict(type='http.response.body', body=b''))
+        async def _send(msg):
+            if msg['type'] == 'http.response.start' and msg['status'] == 200: msg['headers'] = list(msg.get('headers', [])) + headers
+            await send(msg)
+        await self.app(scope, receive, _send)
 
-   for g in root.findall(".//g[@class='node']"):
-      nte = g.find('title')
-      nt = nte.text if nte is not None else None
-      ni = g.get('id')
-      nc = g.get('class')
+# %% ../nbs/03_create_webapp.ipynb #7511e9cb
+class DbExecutor:
+    """Runs the blocking database work and graph renders of async routes off the event loop: writes one by one on a single thread, other work on a pool."""
+    def __init__(self, workers: int = 4): # Number of threads for reads and renders
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix='db-writer')
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix='db-worker')
 
-      # I assume every element only has one polygon
-      nfc = g.find('polygon').get('fill')
-      nsc = g.find('polygon').get('stroke')
+    @staticmethod
+    async def _submit(pool, f, *args, **kwargs):
+        ctx = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(pool, partial(ctx.run, f, *args, **kwargs))
 
-      # Text can have multiple lines
-      nts = [t.text for t in g.findall('text')]
-    
-      nodes[nt] = {
-         'id': ni,
-         'class': nc,
-         'fill': nfc,
-         'stroke': nsc,
-         'text': nts
-         }
+    async def write(self, f: Callable, *args, **kwargs):
+        """Call `f` with `args` and `kwargs` on the writer thread, after the writes before it."""
+        return await self._submit(self._writer, f, *args, **kwargs)
 
-   return nodes
+    async def run(self, f: Callable, *args, **kwargs):
+        """Call `f` with `args` and `kwargs` on the pool, for reads and renders."""
+        return await self._submit(self._pool, f, *args, **kwargs)
 
-# %% ../nbs/03_create_webapp.ipynb #9d1e2f7f
-def add_onclick_to_nodes(svg_str: str):
-    # Get node information
-    nodes = dict_svgnodes(svg_str)
-    
-    # Add onclick to each Tool-node's <g> element
-    for n, d in nodes.items():
-        node_id = d['id']
-        if d['fill'] != 'none': # Skip all info-items
-            tool_phase = n.split('_')
-            tool = ossys.sanitize_name(tool_phase[0])
-            phase = ossys.sanitize_name(tool_phase[1])
-            onclick_attr = f'onclick="htmx.ajax(\'GET\', \'/tool?slug={tool}\', {{target: \'#main-content\', swap: \'outerHTML\'}})"'
-        if d['fill'] == 'white': # Get all info-items
-            name_split = n.split('_')
-            resource = n.split('_')[1:] # remove the "source" part of the name
-            resource = '_'.join(resource)
-            resource = ossys.sanitize_name(resource)
-            onclick_attr = f'onclick="htmx.ajax(\'GET\', \'/resource?slug={resource}\', {{target: \'#main-content\', swap: \'outerHTML\'}})"'
-        
-        # Replace the <g> tag to add onclick
-        old_pattern = f'<g id="{node_id}" class="node">'
-        new_pattern = f'<g id="{node_id}" class="node" {onclick_attr}>'
-        svg_str = svg_str.replace(old_pattern, new_pattern)
-    
-    return svg_str
+    def close(self):
+        """Wait for the submitted work and stop the threads."""
+        self._writer.shutdown(); self._pool.shutdown()
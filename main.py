@@ -1,49 +1,119 @@
 from __future__ import annotations
+import io
+import os
 import re
-import json
-import graphviz
-import xml.etree.ElementTree as ET
+from contextlib import asynccontextmanager
 
-from enum import Enum
-from typing import Union, ClassVar
-
-from pydantic import BaseModel, field_serializer, field_validator, Field, computed_field
-from fastlite import *
-from fastcore.test import *
-from hopsa import ossys
 from fasthtml.common import *
 from monsterui.all import *
 
 from infoflow.classdb import *
 from infoflow.viz import *
 from infoflow.webapp import *
-
-db = create_db("./data/infoflow.db")
-[Tool.from_db(t) for t in db.t.tools()]
-
-create_tables_from_pydantic(db, [InformationItem, Tool, Improvement])
-
+from infoflow.render import *
+from infoflow.importer import *
+from infoflow.exporter import *
+from infoflow.coverage import *
+from infoflow.search import *
+from infoflow.views import *
+from infoflow.migrations import *
+from functools import partial
+
+# Every thread that handles requests, saves or renders gets a connection of its own
+db = ConnectionPool("./data/infoflow.db", os.environ.get("INFOFLOW_DB_PROFILE", "dashboard"))
+
+# Creates or updates the tables, a single query when the schema is up to date
+migrate(db)
+
+viz_backend = os.environ.get("INFOFLOW_VIZ_BACKEND", "graphviz")
+svg_cache = RenderCache()
+max_renders = int(os.environ.get("INFOFLOW_MAX_RENDERS", 2))
+renderer = RenderCoordinator(max_renders=max_renders, cache=svg_cache)
+# Saves and renders of the async routes run on these threads, so they don't block the event loop
+dbx = DbExecutor(workers=max_renders + 2)
+dot_pool = DotPool(size=max_renders, max_renders=int(os.environ.get("INFOFLOW_DOT_RECYCLE", 200)))
+# Above this many items the graph shows one node per information type, that expands on click
+aggregate_at = int(os.environ.get("INFOFLOW_AGGREGATE_AT", 200))
+
+def _render_view(key: str) -> str:
+    "Render the stored view `key` (see `view_key`) from the models in `repo`."
+    kind, _, slug = key.partition(":")
+    if kind == "tool": return _viz_svg(tool_filter=slug)
+    if kind == "item": return _viz_svg(items=repo.items[slug])
+    return _viz_svg()
+
+def _sync_repo() -> int:
+    "Load the saves of the other workers into `repo` before a view is rendered, and return the revision it's rendered from."
+    repo.sync()
+    return repo.db_revision
+
+# The main graph, the tool graphs and the item graphs are stored rendered, and re-rendered in the background after a save
+views = ViewStore(db, _render_view, sync=_sync_repo)
+repo = Repository(db, indexes=dict(coverage=Coverage, views=partial(ViewIndex, store=views)))
+
+@asynccontextmanager
+async def lifespan(app):
+    if viz_backend == "graphviz": dot_pool.start()
+    views.start()
+    yield
+    views.close()
+    dbx.close()
+    dot_pool.close()
+    db.close()
+
+def _sync_repo(req):
+    "Pick up the saves of the other workers on the same database before handling a request"
+    repo.sync()
 
 app, rt = fast_app(
     hdrs=[
         Style(".node { cursor: pointer; }"),
+        GraphLinkHandler(),
         Theme.blue.headers(),
     ],
+    lifespan=lifespan,
+    before=Beforeware(_sync_repo, skip=[r"/favicon\.ico", r"/static/.*", r".*\.css", r".*\.js"]),
+    middleware=[
+        # Read-only views answer If-None-Match with 304 until a save or a render of any worker changes the data or the stored views
+        # Both versions are stored in the database, so every worker gives the same page the same tag
+        Middleware(ConditionalGet, etag=lambda: f"{db_revision(db)}.{views_version(db)}",
+                   paths=["/", "/tool", "/resource", "/improvement", "/all_tools_improvements", "/tool_improvements", "/graph_group", "/coverage"]),
+        Middleware(RegistryScope),
+    ],
 )
 
 def H2_cp(*c, **kwargs): return H2(*c, **kwargs, cls="text-primary")
 def H4_cp(*c, **kwargs): return H4(*c, **kwargs, cls="text-primary")
 
+def _viz_svg(
+        items: InformationItem | dict[str, InformationItem] = None,
+        tools: Tool | dict[str, Tool] = None,
+        tool_filter: str = None,
+        group_by: str = None,
+        params: dict = None, # More query parameters for the group links, see `create_workflow_viz`
+    ) -> str:
+    if group_by is None and items is None:
+        n = len(repo.toolflow.items_for_tool(tool_filter) if tool_filter else repo.items)
+        if n > aggregate_at: group_by = "type"
+    # The views index counts the saves that change a view, so without explicit items or tools its version identifies the graph
+    if items is None and tools is None: key = f"{view_key(tool=tool_filter)}@{repo.indexes['views'].version(view_key(tool=tool_filter))}-{group_by}"
+    else: key = f"{viz_key(repo.items if items is None else items, repo.tools if tools is None else tools, tool_filter)}-{group_by}-{sorted((params or {}).items())}"
+    def _render():
+        its = repo.toolflow if items is None else items
+        tls = repo.toolflow.tools if tools is None else tools
+        viz = create_workflow_viz(items=its, tools=tls, tool_filter=tool_filter, backend=viz_backend, pool=dot_pool, group_by=group_by, params=params)
+        return viz._repr_image_svg_xml()
+    return renderer.render(key, _render)
+
 def WorkflowViz(
         items: InformationItem | dict[str, InformationItem] = None,
         tools: Tool | dict[str, Tool] = None,
         tool_filter: str = None,
+        group_by: str = None,
+        view: str = None, # Key of a stored view, see `view_key`, instead of rendering `items`
+        params: dict = None, # More query parameters for the group links
     ):
-    if items is None: items = dict_from_db(db.t.information_items, InformationItem)
-    if tools is None: tools = dict_from_db(db.t.tools, Tool)
-    viz = create_workflow_viz(items=items, tools=tools, tool_filter=tool_filter)
-    svg_str = viz._repr_image_svg_xml()
-    interactive_svg = add_onclick_to_nodes(svg_str)
+    interactive_svg = views.get(view) if view else _viz_svg(items, tools, tool_filter, group_by, params)
     return Div(NotStr(interactive_svg), id="infoflow-graph", style="text-align:center; margin:20px;")
 
 def format_toolflow(toolflow_val):
@@ -51,21 +121,9 @@ def format_toolflow(toolflow_val):
     if isinstance(toolflow_val, (list, tuple)): return ", ".join(toolflow_val)
     return toolflow_val
 
-def _row_id(row): return getattr(row, "id") if hasattr(row, "id") else row("id")
-
-def ensure_unique_slug(table, slug, current_id=None):
-    matches = table("slug=?", (slug,))
-    if not matches: return
-    # Check if the we are updating an existing item, else raise a ValueError
-    cid = int(current_id) if current_id is not None else None
-    for row in matches:
-        rid = int(_row_id(row))
-        if cid is None or rid != cid:
-            raise ValueError("An item with this name already exists. Please choose a different name.")
-
 def _improvement_form_fields(imp=None, tool=None):
     """Build form fields for improvement (create or edit)"""
-    all_tools = db.t.tools()
+    all_tools = repo.tools.values()
     tool_slug = imp.tool if imp else tool
     
     tool_options = [Option(t.name, value=t.slug, selected=t.slug==tool_slug) for t in all_tools]
@@ -105,7 +163,7 @@ def _resource_form_fields(item: InformationItem | None = None):
     return info_type_options, phase_method_selects, toolflow_inputs
 
 
-async def _improvement_save(form_data, slug=None):
+async def _improvement_save(form_data):
     """Save improvement (create new or update existing)"""
     imp_id = form_data.get("id")
     new_imp = Improvement(
@@ -118,28 +176,38 @@ async def _improvement_save(form_data, slug=None):
         tool=form_data.get("tool"),
         phase=Phase(form_data.get("phase"))
     )
-    ensure_unique_slug(db.t.improvements, new_imp.slug, new_imp.id)
-    
-    if slug:
-        db.t.improvements.update(new_imp.flatten_for_db())
-    else:
-        db.t.improvements.insert(new_imp.flatten_for_db())
-    
-    return new_imp
+    return await dbx.write(repo.save_improvement, new_imp)
 
 top_nav = NavBar(
             Button("← Back to Index", hx_get="/", hx_target="body", hx_swap="innerHTML", cls=ButtonT.text),
+            Button("Coverage", hx_get="/coverage", hx_target="#main-content", hx_swap="innerHTML", cls=ButtonT.text),
             Button("Improvements", hx_get="/all_tools_improvements", hx_target="#main-content", hx_swap="innerHTML", cls=ButtonT.text),
             Button("+ Add Information Item", hx_get="/resource_add", hx_target="#main-content", hx_swap="innerHTML", cls=ButtonT.secondary),
+            Button("Import / Export", hx_get="/import_form", hx_target="#main-content", hx_swap="innerHTML", cls=ButtonT.text),
+            Input(type="search", name="q", placeholder="Search...", hx_get="/search", hx_trigger="input changed delay:200ms, search", hx_target="#main-content", hx_swap="innerHTML", cls="w-48"),
             Button("Theme Switcher", hx_get="/theme_switcher", hx_target="#main-content", hx_swap="innerHTML", cls=ButtonT.text),
             brand=H2("Information Flow Dashboard"),
         )
 
 @rt
-def index():
+async def index():
     return Title("Information Flow Dashboard"), Container(
         top_nav,
-        DivCentered(WorkflowViz(), id="main-content"),
+        DivCentered(await dbx.run(WorkflowViz, view=view_key()), id="main-content"),
+    )
+
+@rt
+async def graph_group(by: str, key: str, tool: str = None, type: str = None):
+    "Expand a group node of the aggregated graph: a large type into its toolflows, otherwise into its items. `tool` and `type` are the filter and the type the group was expanded from."
+    items = repo.toolflow.items_for_tool(tool) if tool else repo.items
+    members = await dbx.run(group_members, items, by, key, **(dict(type=type) if type else {}))
+    sub = "toolflow" if by == "type" and len(members) > aggregate_at else None
+    title = key.replace("_", " ").title() if by == "type" else "Toolflow"
+    # The toolflow groups link back here with this type and the tool filter, so their items stay within both
+    params = {k: v for k,v in dict(tool=tool, type=key if sub else None).items() if v}
+    return Titled(f"{title} ({len(members)} items)",
+        await dbx.run(WorkflowViz, items={i.slug: i for i in members}, group_by=sub, params=params),
+        id="main-content"
     )
 
 @rt
@@ -147,15 +215,14 @@ def theme_switcher():
     return ThemePicker()
 
 @rt
-def tool(slug: str):
-    tool_dict = db.t.tools("slug=?", (slug,))[0]
-    tool = Tool.from_db(tool_dict)
+async def tool(slug: str):
+    tool = repo.tools[slug]
     
     return Titled(f"Tool: {tool.name}",
         DivFullySpaced(
             Card(
                 H3("Workflow Visualization"),
-                WorkflowViz(tool_filter=slug),
+                await dbx.run(WorkflowViz, view=view_key(tool=slug)),
                 style="margin-right:20px;"
             ),
             Card(
@@ -185,8 +252,7 @@ def tool(slug: str):
 
 @rt
 def tool_edit(slug: str):
-    tool_row = db.t.tools("slug=?", (slug,))[0]
-    tool = Tool.from_db(tool_row)
+    tool = repo.tools[slug]
     
     phase_selects = []
     for phase in ["collect", "retrieve", "consume", "extract", "refine"]:
@@ -263,8 +329,7 @@ async def tool_save(slug: str, req):
             **{phase: form_data.get(phase) or None for phase in ["collect", "retrieve", "consume", "extract", "refine"]}
         )
 
-        ensure_unique_slug(db.t.tools, updated_tool.slug, updated_tool.id)
-        db.t.tools.update(updated_tool.flatten_for_db())
+        await dbx.write(repo.save_tool, updated_tool)
         return RedirectResponse(url=f"/tool?slug={updated_tool.slug}", status_code=303)
         
     except Exception as e:
@@ -275,15 +340,14 @@ async def tool_save(slug: str, req):
             )
         )
 @rt
-def resource(slug: str):
-    item_dict = db.t.information_items("slug=?", (slug,))[0]
-    item = InformationItem.from_db(item_dict)
+async def resource(slug: str):
+    item = repo.items[slug]
     
     return Titled(f"Information Item: {item.name}",
         DivFullySpaced(
             Card(
                 H3("Workflow Visualization"),
-                WorkflowViz(items=item),
+                await dbx.run(WorkflowViz, view=view_key(item=item.slug)),
                 style="margin-right:20px;"
             ),
             Card(
@@ -310,8 +374,7 @@ def resource(slug: str):
 
 @rt
 def resource_edit(slug: str):
-    item_row = db.t.information_items("slug=?", (slug,))[0]
-    item = InformationItem.from_db(item_row)
+    item = repo.items[slug]
     
     info_type_options, phase_method_selects, toolflow_inputs = _resource_form_fields(item)
     
@@ -388,8 +451,7 @@ async def resource_save(slug: str, req):
             toolflow=toolflow
         )
 
-        ensure_unique_slug(db.t.information_items, updated_item.slug, updated_item.id)
-        db.t.information_items.update(updated_item.flatten_for_db())
+        await dbx.write(repo.save_item, updated_item)
         return RedirectResponse(url=f"/resource?slug={updated_item.slug}", status_code=303)
         
     except Exception as e:
@@ -464,8 +526,7 @@ async def resource_create(req):
             method=method,
             toolflow=toolflow
         )
-        ensure_unique_slug(db.t.information_items, new_item.slug)
-        db.t.information_items.insert(new_item.flatten_for_db())
+        await dbx.write(repo.save_item, new_item)
         return RedirectResponse(url=f"/resource?slug={new_item.slug}", status_code=303)
     except Exception as e:
         return Titled("Validation Error",
@@ -475,38 +536,185 @@ async def resource_create(req):
             )
         )
 
+@rt("/import_form")
+def import_form():
+    export_links = [
+        Tr(Td(label), *[Td(A(fmt.upper(), href=f"/export?kind={kind}&fmt={fmt}", download=True, cls=AT.primary)) for fmt in ("jsonl", "csv")])
+        for label, kind in (("Information Items", "items"), ("Tools", "tools"), ("Improvements", "improvements"))
+    ]
+    return Titled("Import / Export",
+        DivFullySpaced(
+            Button("← Back to Index", hx_get="/", hx_target="body", hx_swap="innerHTML"),
+            cls="uk-margin-bottom"
+        ),
+        Card(
+            H3("Import Information Items or Tools"),
+            P("Upload a JSONL or CSV file with one record per line, with the same fields as stored in the database."),
+            Form(
+                LabelSelect(Option("Information Items", value="items", selected=True), Option("Tools", value="tools"), label="Import", name="kind"),
+                LabelInput("File", name="file", type="file", accept=".jsonl,.ndjson,.csv", required=True),
+                DivLAligned(
+                    Button("Import", type="submit", cls=ButtonT.primary),
+                    Button("Cancel", hx_get="/", hx_target="body", hx_swap="innerHTML"),
+                    cls="uk-margin-top"
+                ),
+                hx_post="/import_run",
+                hx_encoding="multipart/form-data",
+                hx_target="#main-content",
+                hx_swap="innerHTML"
+            )
+        ),
+        Card(
+            H3("Export"),
+            Table(Tbody(*export_links)),
+        ),
+        id="main-content"
+    )
+
+def _closing(lines, edb):
+    try: yield from lines
+    finally: edb.conn.close()
+
+@rt("/export")
+def export(kind: str = "items", fmt: str = "jsonl"):
+    # The response reads the lines on whichever threads are free, so the cursor gets a connection of its own instead of one of the pool
+    edb = db.connect()
+    try: lines = export_lines(edb, kind, fmt)
+    except ValueError as e:
+        edb.conn.close()
+        return Response(str(e), status_code=400)
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return StreamingResponse(_closing(lines, edb), media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{kind}.{fmt}"'})
+
+def _bulk_import(src, kind, fmt):
+    # Validates in this thread: worker processes would be forked from a server with threads, open connections and `dot` processes
+    with use_profile(db.db, "bulk_import"): return bulk_import(db, src, kind, fmt, workers=0)
+
+@rt("/import_run")
+async def import_run(req):
+    form_data = await req.form()
+    upload = form_data.get("file")
+    try:
+        if not getattr(upload, "filename", None): raise ValueError("Please choose a file to import.")
+        src = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        fmt = upload.filename.rsplit(".", 1)[-1].lower()
+        report = await dbx.write(_bulk_import, src, form_data.get("kind") or "items", fmt)
+    except Exception as e:
+        return Titled("Import Error",
+            Card(
+                P(f"Error importing file: {str(e)}"),
+                Button("Back", hx_get="/import_form", hx_target="#main-content", hx_swap="innerHTML")
+            )
+        )
+    await dbx.write(views.clear)
+    await dbx.write(repo.load)
+    errors = Table(
+        Thead(Tr(Th("Line"), Th("Error"))),
+        Tbody(*[Tr(Td(str(line)), Td(err)) for line, err in report.errors[:100]]),
+    ) if report.errors else P("All records were imported.")
+    return Titled("Import Result",
+        Card(
+            H3(str(report)),
+            errors,
+            P(f"Showing the first 100 of {len(report.errors)} skipped records.") if len(report.errors) > 100 else "",
+            Button("Back to Index", hx_get="/", hx_target="body", hx_swap="innerHTML", cls=ButtonT.primary),
+        )
+    )
+
+_hit_urls = dict(tool="/tool?slug={}", item="/resource?slug={}", improvement="/improvement?slug={}")
+
+def _highlight(snippet: str):
+    parts = re.split(f"({HIT_START}.*?{HIT_END})", snippet)
+    return Span(*[Mark(p[1:-1]) if p.startswith(HIT_START) else p for p in parts if p])
+
+@rt("/search")
+def search_page(q: str = ""):
+    hits = search(db, q, limit=30)
+    rows = [
+        Tr(Td(hit.kind.title()), Td(Strong(hit.name)), Td(_highlight(hit.snippet)),
+           style="cursor:pointer;", hx_get=_hit_urls[hit.kind].format(hit.slug), hx_target="#main-content", hx_swap="innerHTML")
+        for hit in hits
+    ]
+    return Titled(f"Search results for '{q}'" if q.strip() else "Search",
+        Table(Thead(Tr(Th("Type"), Th("Name"), Th("Match"))), Tbody(*rows)) if rows
+        else P("Type in the search box to find tools, information items and improvements." if not q.strip() else "Nothing found."),
+    )
+
+_gap_styles = dict(
+    no_tool=("No tool", "background-color:#fecaca;"),
+    weak_only=("Only bad tools", "background-color:#fed7aa;"),
+    well_served=("Covered", "background-color:#bbf7d0;"),
+)
+
+def _coverage_cell(cov, gaps, t, p, info_type, phase):
+    if gaps.no_tool[t, p]: status = "no_tool"
+    elif gaps.weak_only[t, p]: status = "weak_only"
+    else: status = "well_served"
+    tools = [Div(f"{repo.tools[slug].name if slug in repo.tools else slug} ({n})") for slug, n in cov.top_tools(info_type, phase)]
+    return Td(Strong(_gap_styles[status][0]), *tools, style=_gap_styles[status][1])
+
+@rt
+def coverage():
+    cov = repo.indexes["coverage"]
+    gaps = cov.gaps()
+    phases, types = list(Phase), list(InformationType)
+    rows = [
+        Tr(Td(Strong(info_type.value.replace("_", " ").title()), Div(f"{gaps.n_items[t]} items")),
+           *[_coverage_cell(cov, gaps, t, p, info_type, phase) for p, phase in enumerate(phases)])
+        for t, info_type in enumerate(types) if gaps.n_items[t]
+    ]
+    no_refine = [it.value.replace("_", " ").title() for it in gaps.types_without_refine]
+    no_tool_phases = [p.value.title() for p in gaps.phases_without_tool]
+    return Titled("Coverage of the workflow",
+        Card(
+            H3("Gaps"),
+            P(Strong("Phases without a tool: "), ", ".join(no_tool_phases) or "None"),
+            P(Strong("Information types that never get to refine: "), ", ".join(no_refine) or "None"),
+        ),
+        Card(
+            Table(
+                Thead(Tr(Th("Information type"), *[Th(p.value.title()) for p in phases])),
+                Tbody(*rows),
+            ),
+            P("Every cell shows the tools used most by the items of that type in that phase, with the number of items.", cls=TextPresets.muted_sm),
+        ),
+    )
+
+IMPROVEMENTS_PAGE = 10
+
+def _improvement_rows(tool_slug, page, cursor):
+    rows = [
+        Tr(
+            Td(imp.name),
+            Td(str(imp.prio), style="text-align:center"),
+            style="cursor:pointer;",
+            hx_get=f"/improvement?id={imp.id}",
+            hx_target="#main-content",
+            hx_swap="innerHTML"
+        )
+        for imp in page
+    ]
+    if cursor:
+        rows.append(Tr(Td(
+            Button("Load more", hx_get=f"/tool_improvements?tool={tool_slug}&prio={cursor[0]}&id={cursor[1]}", hx_target="closest tr", hx_swap="outerHTML", cls=ButtonT.text),
+            colspan="2", style="text-align:center")))
+    return rows
+
 @rt
-def all_tools_improvements():
-    tools = db.t.tools()
-    improvements = db.t.improvements()
-    
-    imp_by_tool = {}
-    for imp in improvements:
+def tool_improvements(tool: str, prio: int, id: int):
+    page, cursor = improvements_for_tool(db, tool, after=(prio, id), limit=IMPROVEMENTS_PAGE)
+    return tuple(_improvement_rows(tool, page, cursor))
 
-    # item_row = db.t.information_items("slug=?", (slug,))[0]
-        tool_slug = imp.tool
-        if tool_slug not in imp_by_tool: imp_by_tool[tool_slug] = []
-        imp_by_tool[tool_slug].append(imp)
-    
+@rt
+def all_tools_improvements():
     tool_cards = []
-    for tool in tools:
-        tool_slug = tool.slug
-        tool_imps = sorted(imp_by_tool.get(tool_slug, []), key=lambda x: x.prio)
-        
-        if tool_imps:
+    for tool_slug, (page, cursor) in improvements_by_tool(db, limit=IMPROVEMENTS_PAGE).items():
+        tool = repo.tools.get(tool_slug)
+        if tool is None: continue
+        if page:
             imp_table = Table(
                     Thead(Tr(Th("Title"), Th("Priority", style="text-align:center"))),
-                    Tbody(*[
-                        Tr(
-                            Td(imp.name), 
-                            Td(str(imp.prio), style="text-align:center"), 
-                            style="cursor:pointer;", 
-                            hx_get=f"/improvement?id={imp.id}", 
-                            hx_target="#main-content", 
-                            hx_swap="innerHTML"
-                        ) 
-                        for imp in tool_imps
-                    ]),
+                    Tbody(*_improvement_rows(tool_slug, page, cursor)),
             )
         else:
             imp_table = P("No improvements")
@@ -533,12 +741,11 @@ def all_tools_improvements():
 @rt
 def improvement(id: int=None, slug: str=None):
     if id:
-        imp_row = db.t.improvements("id=?", (id,))[0]
+        imp = repo.improvement(id)
     elif slug:
-        imp_row = db.t.improvements("slug=?", (slug,))[0]
+        imp = repo.improvements[slug]
     else:
         raise ValueError("No id or slug provided")
-    imp = Improvement.from_db(imp_row)
     slug = imp.slug
     id = imp.id
     
@@ -600,8 +807,7 @@ def improvement_add(tool: str):
 
 @rt
 def improvement_edit(slug: str):
-    imp_row = db.t.improvements("slug=?", (slug,))[0]
-    imp = Improvement.from_db(imp_row)
+    imp = repo.improvements[slug]
     
     return Titled(f"Edit Improvement: {imp.name}",
         DivFullySpaced(
@@ -642,7 +848,7 @@ async def improvement_create(req):
 async def improvement_save(slug: str, req):
     form_data = await req.form()
     try:
-        updated_imp = await _improvement_save(form_data, slug=slug)
+        updated_imp = await _improvement_save(form_data)
         return RedirectResponse(url=f"/improvement?slug={updated_imp.slug}", status_code=303)
     except Exception as e:
         return Titled("Validation Error",